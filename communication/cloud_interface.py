@@ -6,15 +6,56 @@ for global model coordination and synchronization.
 """
 
 import asyncio
+import hashlib
 import logging
+import random
+import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 import aiohttp
 import grpc
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Reconnect delays double from the base up to the cap, with +-50% jitter so
+# fog nodes that lost the cloud together do not retry in lockstep
+RECONNECT_BACKOFF_BASE = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+
+# Channel options used to keep the HTTP/2 connection warm between sync ticks,
+# and how long a health check waits for the pooled channels to connect
+GRPC_READY_TIMEOUT = 10.0
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _json_default(value: Any) -> Any:
+    """Encode tensors, and arrays orjson cannot take natively, as nested lists."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _producer_timestamp(model_data: Dict[str, Any]) -> Optional[float]:
+    """Epoch seconds at which the cloud produced a model, if the payload says."""
+    value = model_data.get("timestamp")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            logger.warning(f"Ignoring unparseable model timestamp: {value!r}")
+    return None
+
 
 class CloudInterface:
     """
@@ -28,18 +69,44 @@ class CloudInterface:
     - Health reporting
     """
 
-    def __init__(self, server_url: str, sync_interval: int, fog_node: Any):
+    def __init__(
+        self,
+        server_url: str,
+        sync_interval: int,
+        fog_node: Any,
+        grpc_pool_size: int = 4,
+        max_sync_interval: Optional[float] = None,
+        batch_results: bool = False,
+    ):
         self.server_url = server_url
         self.sync_interval = sync_interval
+        self.max_sync_interval = max_sync_interval or sync_interval * 8
         self.fog_node = fog_node
+        self.grpc_pool_size = max(1, grpc_pool_size)
+        # Send pending aggregation results in one request to the batch
+        # endpoint; servers without it get one POST per result
+        self.batch_results = batch_results
 
         # Communication state
         self.connected = False
         self.last_sync: Optional[datetime] = None
 
+        # Change detection: local events set the flag, quiet periods stretch
+        # the effective sync interval up to max_sync_interval
+        self._dirty = asyncio.Event()
+        self._current_interval: float = sync_interval
+        self._last_status_sent = 0.0
+        self._last_status_hash: Optional[bytes] = None
+
+        # Aggregation results already delivered, keyed by (fog node, round);
+        # the deque bounds the set to the most recent keys
+        self._sent_result_ids: Deque[Tuple[str, int]] = deque(maxlen=1024)
+        self._sent_result_set: Set[Tuple[str, int]] = set()
+
         # Background tasks
         self._sync_task: Optional[asyncio.Task] = None
         self._running = False
+        self._backoff = RECONNECT_BACKOFF_BASE
 
         # Protocol detection
         self.use_grpc = server_url.startswith("grpc://")
@@ -49,7 +116,14 @@ class CloudInterface:
 
         if self.use_grpc:
             self.server_address = server_url.replace("grpc://", "")
-            self.grpc_channel: Optional[grpc.aio.Channel] = None
+            self._channel_pool: List[grpc.aio.Channel] = []
+
+        # Shared HTTP session (one connection pool for the interface lifetime)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Validators of the last fetched global model, for conditional GETs
+        self._model_etag: Optional[str] = None
+        self._model_last_modified: Optional[str] = None
 
         logger.info(f"Cloud interface initialized for {server_url}")
 
@@ -95,21 +169,35 @@ class CloudInterface:
 
     async def _disconnect(self) -> None:
         """Disconnect from cloud services."""
-        if self.use_grpc and self.grpc_channel:
-            await self.grpc_channel.close()
+        if self.use_grpc:
+            await self._close_channel_pool()
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
         self.connected = False
 
     async def _connect_grpc(self) -> None:
         """Connect using gRPC."""
         try:
-            self.grpc_channel = grpc.aio.insecure_channel(self.server_address)
-
-            # Test connection with health check
-            await self._grpc_health_check()
-            self.connected = True
-
-            logger.info(f"Connected to gRPC server at {self.server_address}")
+            await self._close_channel_pool()
+
+            # A local subchannel pool gives each channel its own TCP
+            # connection, so concurrent RPCs do not share one HTTP/2 stream
+            options = GRPC_CHANNEL_OPTIONS + [("grpc.use_local_subchannel_pool", 1)]
+            self._channel_pool = [
+                grpc.aio.insecure_channel(self.server_address, options=options)
+                for _ in range(self.grpc_pool_size)
+            ]
+
+            # Test connection with health check; the sync loop retries
+            self.connected = await self._grpc_health_check()
+            if self.connected:
+                logger.info(
+                    f"Connected to gRPC server at {self.server_address} "
+                    f"({self.grpc_pool_size} channels)"
+                )
 
         except Exception as e:
             logger.error(f"Failed to connect to gRPC server: {e}")
@@ -128,37 +216,97 @@ class CloudInterface:
             logger.error(f"Failed to connect to HTTP server: {e}")
             raise
 
+    async def _close_channel_pool(self) -> None:
+        """Close every pooled gRPC channel."""
+        for channel in self._channel_pool:
+            await channel.close()
+
+        self._channel_pool = []
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+            )
+        return self._session
+
     async def _grpc_health_check(self) -> bool:
-        """Perform gRPC health check."""
-        # Implementation would depend on your gRPC service definition
-        # For now, just assume success
-        return True
+        """Perform gRPC health check by waiting for every pooled channel."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *(channel.channel_ready() for channel in self._channel_pool)
+                ),
+                timeout=GRPC_READY_TIMEOUT,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"gRPC health check failed: {e!r}")
+            return False
 
     async def _http_health_check(self) -> bool:
         """Perform HTTP health check."""
         try:
-            async with aiohttp.ClientSession() as session:
-                health_url = f"{self.server_url}/health"
-                async with session.get(health_url, timeout=10) as response:
-                    return response.status == 200
+            session = self._get_session()
+            health_url = f"{self.server_url}/health"
+            async with session.get(health_url, timeout=10) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"HTTP health check failed: {e}")
             return False
 
+    def notify_change(self) -> None:
+        """Signal that local state changed and should reach the cloud soon."""
+        self._dirty.set()
+
     async def _sync_loop(self) -> None:
         """Main synchronization loop."""
         while self._running:
             try:
                 if self.connected:
-                    await self._perform_sync()
+                    changed = self._dirty.is_set()
+                    self._dirty.clear()
+                    await self._perform_sync(changed)
+
+                    # Back off while nothing changes, reset on activity
+                    if changed:
+                        self._current_interval = self.sync_interval
+                    else:
+                        self._current_interval = min(
+                            self.max_sync_interval, self._current_interval * 1.5
+                        )
                 else:
                     await self._reconnect()
 
-                await asyncio.sleep(self.sync_interval)
+                if self.connected:
+                    self._backoff = RECONNECT_BACKOFF_BASE
+                    await self._wait_for_next_sync()
+                else:
+                    await asyncio.sleep(self._next_backoff_delay())
 
             except Exception as e:
                 logger.error(f"Error in sync loop: {e}")
-                await asyncio.sleep(self.sync_interval)
+                await asyncio.sleep(self._next_backoff_delay())
+
+    def _next_backoff_delay(self) -> float:
+        """Jittered delay before the next retry; doubles on every call."""
+        delay = min(self._backoff, RECONNECT_BACKOFF_MAX) * (0.5 + random.random())
+        self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+        return delay
+
+    async def _wait_for_next_sync(self) -> None:
+        """Wait until the next sync is due or a local change wakes us."""
+        # Syncs are never closer than sync_interval, which coalesces bursts
+        await asyncio.sleep(self.sync_interval)
+
+        remaining = self._current_interval - self.sync_interval
+        if remaining > 0 and not self._dirty.is_set():
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
 
     async def _reconnect(self) -> None:
         """Attempt to reconnect to cloud services."""
@@ -167,77 +315,133 @@ class CloudInterface:
         except Exception as e:
             logger.warning(f"Reconnection failed: {e}")
 
-    async def _perform_sync(self) -> None:
+    async def _perform_sync(self, changed: bool = True) -> None:
         """Perform synchronization with cloud."""
-        try:
-            # Send fog node status
-            await self._send_status_update()
-
-            # Check for global model updates
-            await self._check_global_model_updates()
+        # Send fog node status if it changed, or as a keep-alive once the
+        # backed-off interval has elapsed
+        steps = []
+        status_due = time.monotonic() - self._last_status_sent >= self.max_sync_interval
+        if changed or status_due:
+            steps.append(self._send_status_update(force=status_due))
+            self._last_status_sent = time.monotonic()
+
+        # Check for global model updates and send any pending aggregation
+        # results; the steps are independent, so run them concurrently
+        steps.append(self._check_global_model_updates())
+        steps.append(self._send_aggregation_results())
+
+        # The gRPC calls are no-ops until a service is defined, so channel
+        # health is what tells whether the server is still reachable
+        if self.use_grpc:
+            steps.append(self._grpc_health_check())
+
+        # Each step reports True/False for its request, or None if it had
+        # nothing to send
+        outcomes = []
+        for result in await asyncio.gather(*steps, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Sync step failed: {result}")
+                outcomes.append(False)
+            elif result is not None:
+                outcomes.append(result)
+
+        # Only drop the connection if every request that was made failed
+        if outcomes and not any(outcomes):
+            logger.error("Sync failed")
+            self.connected = False
+            return
 
-            # Send any pending aggregation results
-            await self._send_aggregation_results()
+        self.last_sync = datetime.now()
+        logger.debug("Cloud sync completed")
 
-            self.last_sync = datetime.now()
-            logger.debug("Cloud sync completed")
+    async def _send_status_update(self, force: bool = False) -> Optional[bool]:
+        """Send fog node status to cloud, unless it is unchanged.
 
-        except Exception as e:
-            logger.error(f"Sync failed: {e}")
-            self.connected = False
+        Returns whether the status was delivered, or None if it was skipped.
+        """
+        status = orjson.dumps(self.fog_node.get_status())
+        status_hash = hashlib.blake2b(status, digest_size=8).digest()
 
-    async def _send_status_update(self) -> None:
-        """Send fog node status to cloud."""
-        status = self.fog_node.get_status()
+        if status_hash == self._last_status_hash and not force:
+            logger.debug("Status unchanged, skipping update")
+            return None
 
+        sent = False
         if self.use_grpc:
-            await self._send_status_grpc(status)
+            sent = await self._send_status_grpc(status)
         elif self.use_http:
-            await self._send_status_http(status)
+            sent = await self._send_status_http(status)
+
+        if sent:
+            self._last_status_hash = status_hash
+        return sent
 
-    async def _send_status_grpc(self, status: Dict[str, Any]) -> None:
-        """Send status via gRPC."""
+    async def _send_status_grpc(self, status: bytes) -> Optional[bool]:
+        """Send encoded status via gRPC."""
         # Implementation would depend on your gRPC service definition
-        logger.debug("Sent status via gRPC")
+        return None
 
-    async def _send_status_http(self, status: Dict[str, Any]) -> None:
-        """Send status via HTTP."""
+    async def _send_status_http(self, status: bytes) -> bool:
+        """Send encoded status via HTTP."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.server_url}/fog-nodes/{self.fog_node.node_id}/status"
-                async with session.post(url, json=status, timeout=30) as response:
-                    if response.status == 200:
-                        logger.debug("Sent status via HTTP")
-                    else:
-                        logger.warning(f"Status update failed: {response.status}")
+            session = self._get_session()
+            url = f"{self.server_url}/fog-nodes/{self.fog_node.node_id}/status"
+            async with session.post(url, data=status, headers=JSON_HEADERS) as response:
+                if response.status == 200:
+                    logger.debug("Sent status via HTTP")
+                    return True
+
+                logger.warning(f"Status update failed: {response.status}")
+                return False
         except Exception as e:
             logger.error(f"Failed to send status via HTTP: {e}")
+            return False
 
-    async def _check_global_model_updates(self) -> None:
+    async def _check_global_model_updates(self) -> Optional[bool]:
         """Check for global model updates from cloud."""
         if self.use_grpc:
-            await self._check_model_updates_grpc()
-        elif self.use_http:
-            await self._check_model_updates_http()
+            return await self._check_model_updates_grpc()
+        if self.use_http:
+            return await self._check_model_updates_http()
+        return False
 
-    async def _check_model_updates_grpc(self) -> None:
+    async def _check_model_updates_grpc(self) -> Optional[bool]:
         """Check for model updates via gRPC."""
         # Implementation would depend on your gRPC service definition
-        pass
+        return None
 
-    async def _check_model_updates_http(self) -> None:
+    async def _check_model_updates_http(self) -> bool:
         """Check for model updates via HTTP."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.server_url}/models/latest"
-                params = {"region": self.fog_node.region}
-
-                async with session.get(url, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        model_data = await response.json()
-                        await self._process_global_model_update(model_data)
+            session = self._get_session()
+            url = f"{self.server_url}/models/latest"
+            params = {"region": self.fog_node.region}
+
+            # Only download the weights if they changed since the last fetch
+            headers = {}
+            if self._model_etag:
+                headers["If-None-Match"] = self._model_etag
+            if self._model_last_modified:
+                headers["If-Modified-Since"] = self._model_last_modified
+
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status == 304:
+                    logger.debug("Global model not modified")
+                    return True
+
+                if response.status == 200:
+                    model_data = orjson.loads(await response.read())
+                    await self._process_global_model_update(model_data)
+
+                    self._model_etag = response.headers.get("ETag")
+                    self._model_last_modified = response.headers.get("Last-Modified")
+                    return True
+
+                logger.warning(f"Model update check failed: {response.status}")
+                return False
         except Exception as e:
             logger.error(f"Failed to check model updates via HTTP: {e}")
+            return False
 
     async def _process_global_model_update(self, model_data: Dict[str, Any]) -> None:
         """Process a global model update from cloud."""
@@ -248,7 +452,11 @@ class CloudInterface:
         if weights and version:
             # Cache the new model
             await self.fog_node.model_cache.cache_model(
-                model_id, weights, version, model_data.get("metadata", {})
+                model_id,
+                weights,
+                version,
+                model_data.get("metadata", {}),
+                original_timestamp=_producer_timestamp(model_data),
             )
 
             # Optionally broadcast to edge devices
@@ -258,26 +466,68 @@ class CloudInterface:
 
     async def _broadcast_model_update(self, model_data: Dict[str, Any]) -> None:
         """Broadcast model update to edge devices."""
-        await self.fog_node.edge_interface.broadcast_to_devices(
-            "model/update", model_data
-        )
+        await self.fog_node.edge_interface.broadcast_model_update(model_data)
+
+    async def _send_aggregation_results(self) -> Optional[bool]:
+        """Send regional aggregation results to cloud in a single batch.
+
+        Returns whether the batch was delivered, or None if nothing was pending.
+        """
+        # Implementation would depend on your gRPC service definition; until
+        # then results stay pending instead of being encoded on every sync
+        if self.use_grpc:
+            return None
 
-    async def _send_aggregation_results(self) -> None:
-        """Send regional aggregation results to cloud."""
         # Get recent aggregation results
-        recent_results = self.fog_node.regional_aggregator.aggregation_history[
-            -5:
-        ]  # Last 5
+        recent_results = self.fog_node.regional_aggregator.recent_results(5)
 
+        # Skip results that have already been sent
+        pending: List[Tuple[Tuple[str, int], bytes]] = []
         for result in recent_results:
-            # Check if this result has already been sent
-            if not hasattr(result, "_sent_to_cloud"):
-                await self._send_aggregation_result(result)
-                result._sent_to_cloud = True
-
-    async def _send_aggregation_result(self, result) -> None:
-        """Send a single aggregation result to cloud."""
-        aggregation_data = {
+            key = (result.fog_node_id, result.aggregation_round)
+            if key in self._sent_result_set:
+                continue
+
+            try:
+                encoded = orjson.dumps(
+                    self._build_aggregation_data(result),
+                    default=_json_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                )
+            except TypeError as e:
+                # Retrying cannot help, and it would hold back later results
+                logger.error(f"Dropping unencodable aggregation result {key}: {e}")
+                self._mark_result_sent(key)
+                continue
+            pending.append((key, encoded))
+
+        if not pending:
+            return None
+
+        if self.batch_results:
+            batch = b'{"results":[' + b",".join(data for _, data in pending) + b"]}"
+            sent = await self._send_aggregation_batch_http(batch)
+            delivered = [key for key, _ in pending] if sent else []
+        else:
+            delivered = [
+                key for key, data in pending if await self._send_aggregation_http(data)
+            ]
+
+        for key in delivered:
+            self._mark_result_sent(key)
+        return len(delivered) == len(pending)
+
+    def _mark_result_sent(self, key: Tuple[str, int]) -> None:
+        """Remember a delivered result, forgetting the oldest one when full."""
+        if len(self._sent_result_ids) == self._sent_result_ids.maxlen:
+            self._sent_result_set.discard(self._sent_result_ids[0])
+
+        self._sent_result_ids.append(key)
+        self._sent_result_set.add(key)
+
+    def _build_aggregation_data(self, result) -> Dict[str, Any]:
+        """Build the wire representation of an aggregation result."""
+        return {
             "fog_node_id": result.fog_node_id,
             "aggregation_round": result.aggregation_round,
             "participating_clients": result.participating_clients,
@@ -287,30 +537,37 @@ class CloudInterface:
             "created_at": result.created_at.isoformat(),
         }
 
-        if self.use_grpc:
-            await self._send_aggregation_grpc(aggregation_data)
-        elif self.use_http:
-            await self._send_aggregation_http(aggregation_data)
+    async def _send_aggregation_batch_http(self, batch: bytes) -> bool:
+        """Send an encoded batch of aggregation results via HTTP."""
+        return await self._post_aggregation(
+            "aggregation-results:batch", batch, "aggregation results"
+        )
 
-    async def _send_aggregation_grpc(self, data: Dict[str, Any]) -> None:
-        """Send aggregation result via gRPC."""
-        # Implementation would depend on your gRPC service definition
-        logger.debug("Sent aggregation result via gRPC")
+    async def _send_aggregation_http(self, data: bytes) -> bool:
+        """Send one encoded aggregation result via HTTP."""
+        return await self._post_aggregation(
+            "aggregation-results", data, "aggregation result"
+        )
 
-    async def _send_aggregation_http(self, data: Dict[str, Any]) -> None:
-        """Send aggregation result via HTTP."""
+    async def _post_aggregation(self, path: str, body: bytes, what: str) -> bool:
+        """POST encoded aggregation data and report whether it was accepted."""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.server_url}/aggregation-results"
-                async with session.post(url, json=data, timeout=60) as response:
-                    if response.status == 200:
-                        logger.debug("Sent aggregation result via HTTP")
-                    else:
-                        logger.warning(
-                            f"Aggregation result send failed: {response.status}"
-                        )
+            session = self._get_session()
+            async with session.post(
+                f"{self.server_url}/{path}",
+                data=body,
+                headers=JSON_HEADERS,
+                timeout=60,
+            ) as response:
+                if response.status == 200:
+                    logger.debug(f"Sent {what} via HTTP")
+                    return True
+
+                logger.warning(f"{what.capitalize()} send failed: {response.status}")
+                return False
         except Exception as e:
-            logger.error(f"Failed to send aggregation result via HTTP: {e}")
+            logger.error(f"Failed to send {what} via HTTP: {e}")
+            return False
 
     # Public API methods
 
@@ -329,12 +586,12 @@ class CloudInterface:
 
         if self.use_http:
             try:
-                async with aiohttp.ClientSession() as session:
-                    url = f"{self.server_url}/fog-nodes/register"
-                    async with session.post(
-                        url, json=registration_data, timeout=30
-                    ) as response:
-                        return response.status == 200
+                session = self._get_session()
+                url = f"{self.server_url}/fog-nodes/register"
+                async with session.post(
+                    url, data=orjson.dumps(registration_data), headers=JSON_HEADERS
+                ) as response:
+                    return response.status == 200
             except Exception as e:
                 logger.error(f"Registration failed: {e}")
                 return False
@@ -348,11 +605,11 @@ class CloudInterface:
         """Request latest global model from cloud."""
         if self.use_http:
             try:
-                async with aiohttp.ClientSession() as session:
-                    url = f"{self.server_url}/models/{model_id}/latest"
-                    async with session.get(url, timeout=60) as response:
-                        if response.status == 200:
-                            return await response.json()
+                session = self._get_session()
+                url = f"{self.server_url}/models/{model_id}/latest"
+                async with session.get(url, timeout=60) as response:
+                    if response.status == 200:
+                        return orjson.loads(await response.read())
             except Exception as e:
                 logger.error(f"Failed to request global model: {e}")
 
@@ -6,15 +6,45 @@ lightweight protocols optimized for edge environments.
 """
 
 import asyncio
-import json
+import functools
 import logging
+import random
+import re
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
-import paho.mqtt.client as mqtt
+import aiomqtt
+
+from .payload_codec import (
+    WEIGHT_MESSAGE_TYPES,
+    decode_payload,
+    decode_weights,
+    encode_payload,
+)
 
 logger = logging.getLogger(__name__)
 
+# Granularity of the timestamps stamped on outgoing acks and responses
+TIMESTAMP_RESOLUTION = 0.5
+
+# Broker reconnect delays double from the base up to the cap, with +-50%
+# jitter so devices and fog nodes do not all retry on the same tick
+RECONNECT_BACKOFF_BASE = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+
+# Outgoing MQTT limits: model payloads are published with QoS 1 so that the
+# caller waits for the broker ack, and the client caps in-flight/queued data
+MODEL_PUBLISH_QOS = 1
+PUBLISH_TIMEOUT = 30.0
+MAX_INFLIGHT_MESSAGES = 64
+MAX_QUEUED_MESSAGES = 1024
+
+# Identical messages from one device within this many seconds are dropped
+DEDUPE_WINDOW = 2.0
+MAX_DEDUPE_ENTRIES = 4096
+
 
 class EdgeInterface:
     """
@@ -28,39 +58,94 @@ class EdgeInterface:
     - Health monitoring
     """
 
-    def __init__(self, mqtt_broker: str, fog_node: Any):
+    def __init__(
+        self,
+        mqtt_broker: str,
+        fog_node: Any,
+        flush_interval: float = 0.05,
+        max_pending_messages: int = 10_000,
+        max_concurrent_handlers: int = 256,
+    ):
         self.mqtt_broker = mqtt_broker
         self.fog_node = fog_node
+        self.flush_interval = flush_interval
+        self.max_pending_messages = max_pending_messages
 
         # MQTT client
-        self.mqtt_client: Optional[mqtt.Client] = None
+        self.mqtt_client: Optional[aiomqtt.Client] = None
         self.connected = False
+        self._connected_event = asyncio.Event()
+        self._mqtt_task: Optional[asyncio.Task] = None
+        self._reconnect_backoff = RECONNECT_BACKOFF_BASE
 
         # Message handlers
         self.message_handlers: Dict[str, Callable] = {
             "device/register": self._handle_device_registration,
             "device/heartbeat": self._handle_device_heartbeat,
             "training/update": self._handle_training_update,
+            "training/batch": self._handle_training_batch,
             "model/request": self._handle_model_request,
             "task/result": self._handle_task_result,
         }
 
+        # Handlers that process a whole flushed batch of one message type
+        self.batch_handlers: Dict[str, Callable] = {
+            "device/heartbeat": self._handle_device_heartbeat_batch,
+        }
+
+        # Inbound messages are buffered per message type and flushed together
+        self._ingress: Dict[str, Deque[Tuple[str, Dict[str, Any]]]] = {
+            message_type: deque() for message_type in self.message_handlers
+        }
+        self._flush_task: Optional[asyncio.Task] = None
+        # Buffered plus in-flight messages, bounded by max_pending_messages
+        self._pending_count = 0
+        # At most one in-flight batch per message type, keeping each type in
+        # order while a slow type does not hold up the others
+        self._dispatch_tasks: Dict[str, asyncio.Task] = {}
+        self._handler_sem = asyncio.Semaphore(max_concurrent_handlers)
+
+        # Recently seen (device, message type, payload hash) keys, used to
+        # drop retransmits arriving within DEDUPE_WINDOW
+        self._recent_messages: "OrderedDict[Tuple[str, str, int], float]" = (
+            OrderedDict()
+        )
+
+        # Last formatted timestamp and when it was taken, reused by the
+        # ack/response builders within TIMESTAMP_RESOLUTION seconds
+        self._iso_now_cache: Tuple[str, float] = ("", 0.0)
+
+        # Encoded model payloads keyed by the identity of the model object,
+        # so a model pulled by many devices is serialized only once
+        self.max_serialized_models = 4
+        self._serialized_models: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+
         # Topics
         self.base_topic = f"fog/{fog_node.node_id}"
 
+        # Inbound topics look like {base_topic}/{kind}/{device_id}/{action};
+        # route them with one precompiled match and a (kind, action) table
+        self._topic_re = re.compile(
+            rf"^{re.escape(self.base_topic)}/"
+            r"(?P<kind>[^/]+)/(?P<id>[^/]+)/(?P<action>[^/]+)$"
+        )
+        self._handler_table: Dict[Tuple[str, str], str] = {
+            tuple(message_type.split("/")): message_type
+            for message_type in self.message_handlers
+        }
+
+        # Outbound topics are formatted once per (device, message type); the
+        # per-instance LRU keeps the cache bounded as devices come and go
+        self._device_topic = functools.lru_cache(maxsize=4096)(
+            self._format_device_topic
+        )
+        self._broadcast_topics: Dict[str, str] = {}
+
         logger.info(f"Edge interface initialized for broker {mqtt_broker}")
 
     async def start(self) -> None:
         """Start the edge interface."""
         try:
-            # Setup MQTT client
-            self.mqtt_client = mqtt.Client(
-                client_id=f"fog_node_{self.fog_node.node_id}"
-            )
-            self.mqtt_client.on_connect = self._on_mqtt_connect
-            self.mqtt_client.on_disconnect = self._on_mqtt_disconnect
-            self.mqtt_client.on_message = self._on_mqtt_message
-
             # Parse broker address
             if ":" in self.mqtt_broker:
                 host, port = self.mqtt_broker.split(":")
@@ -68,81 +153,228 @@ class EdgeInterface:
             else:
                 host, port = self.mqtt_broker, 1883
 
-            # Connect to broker
-            self.mqtt_client.connect(host, port, 60)
-            self.mqtt_client.loop_start()
+            # Setup MQTT client
+            self.mqtt_client = aiomqtt.Client(
+                host,
+                port,
+                identifier=f"fog_node_{self.fog_node.node_id}",
+                keepalive=60,
+                max_inflight_messages=MAX_INFLIGHT_MESSAGES,
+                max_queued_outgoing_messages=MAX_QUEUED_MESSAGES,
+                max_concurrent_outgoing_calls=MAX_INFLIGHT_MESSAGES,
+            )
+
+            # Connect, subscribe and receive on the event loop
+            self._mqtt_task = asyncio.create_task(self._mqtt_loop())
 
             # Wait for connection
-            for _ in range(10):  # Wait up to 10 seconds
-                if self.connected:
-                    break
-                await asyncio.sleep(1)
-
-            if not self.connected:
+            try:
+                await asyncio.wait_for(self._connected_event.wait(), timeout=10)
+            except asyncio.TimeoutError:
                 raise Exception("Failed to connect to MQTT broker")
 
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
             logger.info("Edge interface started")
 
         except Exception as e:
             logger.error(f"Failed to start edge interface: {e}")
+            await self.stop()
             raise
 
     async def stop(self) -> None:
         """Stop the edge interface."""
-        if self.mqtt_client:
-            self.mqtt_client.loop_stop()
-            self.mqtt_client.disconnect()
-
+        for task in (self._flush_task, self._mqtt_task, *self._dispatch_tasks.values()):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        self._flush_task = None
+        self._mqtt_task = None
+        self._dispatch_tasks.clear()
         self.connected = False
+        self._connected_event.clear()
         logger.info("Edge interface stopped")
 
-    def _on_mqtt_connect(self, client, userdata, flags, rc):
-        """Handle MQTT connection."""
-        if rc == 0:
-            self.connected = True
-            logger.info("Connected to MQTT broker")
-
-            # Subscribe to relevant topics
-            topics = [
-                f"{self.base_topic}/device/+/register",
-                f"{self.base_topic}/device/+/heartbeat",
-                f"{self.base_topic}/training/+/update",
-                f"{self.base_topic}/model/+/request",
-                f"{self.base_topic}/task/+/result",
-            ]
+    async def _mqtt_loop(self) -> None:
+        """Keep the broker connection open and feed inbound messages."""
+        while True:
+            try:
+                async with self.mqtt_client:
+                    await self._on_mqtt_connect()
 
-            for topic in topics:
-                client.subscribe(topic)
-                logger.debug(f"Subscribed to {topic}")
-        else:
-            logger.error(f"Failed to connect to MQTT broker: {rc}")
+                    async for msg in self.mqtt_client.messages:
+                        self._on_mqtt_message(msg)
+
+            except aiomqtt.MqttError as e:
+                self._on_mqtt_disconnect(e)
+            except Exception as e:
+                # Anything else would silently end ingest; reconnect instead
+                logger.error(f"Unexpected error in MQTT loop: {e}")
+                self._on_mqtt_disconnect(e)
+
+            delay = self._reconnect_backoff * (0.5 + random.random())
+            self._reconnect_backoff = min(
+                self._reconnect_backoff * 2, RECONNECT_BACKOFF_MAX
+            )
+            await asyncio.sleep(delay)
 
-    def _on_mqtt_disconnect(self, client, userdata, rc):
+    async def _on_mqtt_connect(self) -> None:
+        """Handle MQTT connection."""
+        self.connected = True
+        self._reconnect_backoff = RECONNECT_BACKOFF_BASE
+        self._connected_event.set()
+        logger.info("Connected to MQTT broker")
+
+        # Subscribe to relevant topics
+        topics = [
+            f"{self.base_topic}/device/+/register",
+            f"{self.base_topic}/device/+/heartbeat",
+            f"{self.base_topic}/training/+/update",
+            f"{self.base_topic}/training/+/batch",
+            f"{self.base_topic}/model/+/request",
+            f"{self.base_topic}/task/+/result",
+        ]
+
+        for topic in topics:
+            await self.mqtt_client.subscribe(topic)
+            logger.debug(f"Subscribed to {topic}")
+
+    def _on_mqtt_disconnect(self, error: Exception) -> None:
         """Handle MQTT disconnection."""
         self.connected = False
-        logger.warning(f"Disconnected from MQTT broker: {rc}")
+        self._connected_event.clear()
+        logger.warning(f"Disconnected from MQTT broker: {error}")
 
-    def _on_mqtt_message(self, client, userdata, msg):
+    def _on_mqtt_message(self, msg: aiomqtt.Message) -> None:
         """Handle incoming MQTT message."""
         try:
-            topic_parts = msg.topic.split("/")
+            topic = msg.topic.value
+            match = self._topic_re.match(topic)
+            if not match:
+                return
 
-            # Extract message type and device ID
-            if len(topic_parts) >= 4:
-                message_type = f"{topic_parts[-2]}/{topic_parts[-1]}"
-                device_id = topic_parts[-2] if len(topic_parts) > 4 else "unknown"
+            message_type = self._handler_table.get((match["kind"], match["action"]))
+            if not message_type:
+                logger.warning(f"No handler for topic: {topic}")
+                return
 
-                # Decode message payload
-                payload = json.loads(msg.payload.decode())
+            if self._is_duplicate(match["id"], message_type, msg.payload):
+                logger.debug(f"Dropped duplicate {message_type} from {match['id']}")
+                return
 
-                # Handle message
-                asyncio.create_task(
-                    self._handle_message(message_type, device_id, payload)
-                )
+            # Decode message payload (JSON, or MessagePack for weights)
+            payload = decode_payload(msg.payload)
+
+            self._schedule_message(message_type, match["id"], payload)
 
         except Exception as e:
             logger.error(f"Error processing MQTT message: {e}")
 
+    def _is_duplicate(self, device_id: str, message_type: str, raw: bytes) -> bool:
+        """Check whether the same message was just received from the device."""
+        now = time.monotonic()
+        key = (device_id, message_type, hash(raw))
+
+        seen_at = self._recent_messages.get(key)
+        if seen_at is not None and now - seen_at < DEDUPE_WINDOW:
+            return True
+
+        self._recent_messages[key] = now
+        self._recent_messages.move_to_end(key)
+        if len(self._recent_messages) > MAX_DEDUPE_ENTRIES:
+            self._recent_messages.popitem(last=False)
+
+        return False
+
+    def _iso_now(self) -> str:
+        """Current time in ISO format, cached for TIMESTAMP_RESOLUTION seconds."""
+        now = time.time()
+        cached, cached_at = self._iso_now_cache
+        if now - cached_at < TIMESTAMP_RESOLUTION:
+            return cached
+
+        cached = datetime.fromtimestamp(now).isoformat()
+        self._iso_now_cache = (cached, now)
+        return cached
+
+    def _schedule_message(
+        self, message_type: str, device_id: str, payload: Dict[str, Any]
+    ) -> None:
+        """Buffer a message for the next flush."""
+        if self._pending_count >= self.max_pending_messages:
+            logger.warning(
+                f"Ingress buffer full, dropping {message_type} from {device_id}"
+            )
+            return
+
+        self._ingress[message_type].append((device_id, payload))
+        self._pending_count += 1
+
+    async def _flush_loop(self) -> None:
+        """Periodically dispatch buffered inbound messages."""
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                self._flush_ingress()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error flushing MQTT messages: {e}")
+
+    def _flush_ingress(self) -> None:
+        """Start dispatching buffered messages, one task per message type.
+
+        A type whose previous batch is still being handled keeps buffering
+        until that batch finishes.
+        """
+        for message_type, queue in self._ingress.items():
+            if not queue or message_type in self._dispatch_tasks:
+                continue
+
+            batch = list(queue)
+            queue.clear()
+
+            task = asyncio.create_task(self._dispatch_batch(message_type, batch))
+            self._dispatch_tasks[message_type] = task
+            task.add_done_callback(
+                functools.partial(self._on_batch_done, message_type, len(batch))
+            )
+
+    def _on_batch_done(self, message_type: str, size: int, task: asyncio.Task) -> None:
+        """Release the pending slots of a handled batch."""
+        self._pending_count -= size
+        if self._dispatch_tasks.get(message_type) is task:
+            del self._dispatch_tasks[message_type]
+
+    async def _dispatch_batch(
+        self, message_type: str, batch: List[Tuple[str, Dict[str, Any]]]
+    ) -> None:
+        """Handle a flushed batch of one message type."""
+        batch_handler = self.batch_handlers.get(message_type)
+        if batch_handler:
+            try:
+                await batch_handler(batch)
+            except Exception as e:
+                logger.error(f"Error handling {message_type} batch: {e}")
+        else:
+            await asyncio.gather(
+                *(
+                    self._handle_message_limited(message_type, device_id, payload)
+                    for device_id, payload in batch
+                )
+            )
+
+    async def _handle_message_limited(
+        self, message_type: str, device_id: str, payload: Dict[str, Any]
+    ):
+        """Handle a message while holding a concurrent-handler slot."""
+        async with self._handler_sem:
+            await self._handle_message(message_type, device_id, payload)
+
     async def _handle_message(
         self, message_type: str, device_id: str, payload: Dict[str, Any]
     ):
@@ -171,7 +403,7 @@ class EdgeInterface:
         response = {
             "status": "success" if success else "failed",
             "fog_node_id": self.fog_node.node_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._iso_now(),
         }
 
         await self._send_to_device(device_id, "register/response", response)
@@ -190,25 +422,96 @@ class EdgeInterface:
             device_id, device_status, metrics
         )
 
+    async def _handle_device_heartbeat_batch(
+        self, batch: List[Tuple[str, Dict[str, Any]]]
+    ):
+        """Handle a flushed batch of device heartbeats in one coordinator call."""
+        from ..fog_node.edge_coordinator import EdgeDeviceStatus
+
+        # Only the latest status of each device matters; metrics accumulate
+        latest: Dict[str, Tuple[EdgeDeviceStatus, Dict[str, float]]] = {}
+        for device_id, payload in batch:
+            try:
+                status = EdgeDeviceStatus(payload.get("status", "online"))
+            except ValueError:
+                logger.warning(f"Invalid heartbeat status from {device_id}")
+                continue
+
+            # Reuse the decoded metrics dict of a device's first heartbeat
+            metrics = payload.get("metrics") or {}
+            if device_id in latest:
+                merged = latest[device_id][1]
+                merged.update(metrics)
+                metrics = merged
+            latest[device_id] = (status, metrics)
+
+        await self.fog_node.edge_coordinator.update_device_status_batch(
+            [
+                (device_id, status, metrics)
+                for device_id, (status, metrics) in latest.items()
+            ]
+        )
+
     async def _handle_training_update(self, device_id: str, payload: Dict[str, Any]):
         """Handle training update from edge device."""
-        model_update = {
-            "weights": payload.get("weights", {}),
-            "sample_count": payload.get("sample_count", 0),
-            "loss": payload.get("loss", 0.0),
-            "metadata": payload.get("metadata", {}),
-        }
+        model_update = self._build_model_update(payload)
 
         success = await self.fog_node.submit_training_update(device_id, model_update)
 
         # Send acknowledgment
         ack = {
             "status": "received" if success else "failed",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._iso_now(),
         }
 
         await self._send_to_device(device_id, "training/ack", ack)
 
+    async def _handle_training_batch(self, gateway_id: str, payload: Dict[str, Any]):
+        """Handle several training updates published together by a gateway.
+
+        The payload carries ``updates``, each with its own ``device_id``.
+        """
+        entries = payload.get("updates", [])
+        updates = []
+        for index, update in enumerate(entries):
+            try:
+                updates.append((update["device_id"], self._build_model_update(update)))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                logger.warning(
+                    f"Skipping invalid update {index} in batch from {gateway_id}: {e!r}"
+                )
+
+        accepted = 0
+        if updates:
+            accepted = await self.fog_node.submit_training_updates(updates)
+
+        if accepted == len(entries):
+            status = "received"
+        elif accepted:
+            status = "partial"
+        else:
+            status = "failed"
+
+        ack = {
+            "status": status,
+            "accepted": accepted,
+            "invalid": len(entries) - len(updates),
+            "total": len(entries),
+            "timestamp": self._iso_now(),
+        }
+
+        await self._send_to_device(gateway_id, "training/batch_ack", ack)
+
+    @staticmethod
+    def _build_model_update(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a decoded training update payload for the fog node."""
+        return {
+            "weights": decode_weights(payload),
+            "sample_count": payload.get("sample_count", 0),
+            "loss": payload.get("loss", 0.0),
+            "metadata": payload.get("metadata", {}),
+        }
+
     async def _handle_model_request(self, device_id: str, payload: Dict[str, Any]):
         """Handle model request from edge device."""
         model_version = payload.get("version")
@@ -216,11 +519,11 @@ class EdgeInterface:
         model_data = await self.fog_node.request_model(device_id, model_version)
 
         if model_data:
-            await self._send_to_device(device_id, "model/update", model_data)
+            await self.send_model_to_device(device_id, model_data)
         else:
             error_response = {
                 "error": "Model not available",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self._iso_now(),
             }
             await self._send_to_device(device_id, "model/error", error_response)
 
@@ -236,31 +539,88 @@ class EdgeInterface:
         self, device_id: str, message_type: str, payload: Dict[str, Any]
     ):
         """Send message to specific edge device."""
-        if not self.connected or not self.mqtt_client:
-            logger.error("MQTT client not connected")
-            return
+        message = encode_payload(payload, binary=message_type in WEIGHT_MESSAGE_TYPES)
+        await self._send_raw_to_device(device_id, message_type, message)
 
-        topic = f"{self.base_topic}/device/{device_id}/{message_type}"
-        message = json.dumps(payload)
+    async def _send_raw_to_device(
+        self, device_id: str, message_type: str, message: bytes, qos: int = 0
+    ):
+        """Send an already encoded message to a specific edge device."""
+        topic = self._device_topic(device_id, message_type)
 
-        self.mqtt_client.publish(topic, message)
-        logger.debug(f"Sent {message_type} to {device_id}")
+        if await self._publish_raw(topic, message, qos):
+            logger.debug(f"Sent {message_type} to {device_id}")
 
-    async def broadcast_to_devices(self, message_type: str, payload: Dict[str, Any]):
-        """Broadcast message to all connected devices."""
+    def _format_device_topic(self, device_id: str, message_type: str) -> str:
+        """Format the topic of a message sent to a specific device."""
+        return f"{self.base_topic}/device/{device_id}/{message_type}"
+
+    async def _publish_raw(self, topic: str, message: bytes, qos: int = 0) -> bool:
+        """Publish pre-encoded bytes without re-serializing them.
+
+        With ``qos`` >= 1 this waits for the broker acknowledgement, which
+        gives large broadcasts backpressure instead of unbounded buffering.
+        """
         if not self.connected or not self.mqtt_client:
             logger.error("MQTT client not connected")
-            return
+            return False
+
+        try:
+            await self.mqtt_client.publish(
+                topic, message, qos=qos, timeout=PUBLISH_TIMEOUT
+            )
+        except (aiomqtt.MqttError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to publish to {topic}: {e}")
+            return False
+
+        return True
 
-        topic = f"{self.base_topic}/broadcast/{message_type}"
-        message = json.dumps(payload)
+    def _encode_model(self, model_data: Dict[str, Any]) -> bytes:
+        """Serialize a model payload, reusing the bytes of a recent encoding."""
+        key = id(model_data)
+        cached = self._serialized_models.get(key)
 
-        self.mqtt_client.publish(topic, message)
-        logger.debug(f"Broadcasted {message_type}")
+        # The cache keeps a reference to the model, so a live id is never reused
+        if cached and cached[0] is model_data:
+            self._serialized_models.move_to_end(key)
+            return cached[1]
+
+        message = encode_payload(model_data, binary=True)
+        self._serialized_models[key] = (model_data, message)
+        if len(self._serialized_models) > self.max_serialized_models:
+            self._serialized_models.popitem(last=False)
+
+        return message
+
+    async def broadcast_to_devices(self, message_type: str, payload: Dict[str, Any]):
+        """Broadcast message to all connected devices."""
+        message = encode_payload(payload, binary=message_type in WEIGHT_MESSAGE_TYPES)
+        await self._broadcast_raw(message_type, message)
+
+    async def _broadcast_raw(self, message_type: str, message: bytes, qos: int = 0):
+        """Broadcast an already encoded message to all connected devices."""
+        topic = self._broadcast_topics.get(message_type)
+        if topic is None:
+            topic = f"{self.base_topic}/broadcast/{message_type}"
+            self._broadcast_topics[message_type] = topic
+
+        if await self._publish_raw(topic, message, qos):
+            logger.debug(f"Broadcasted {message_type}")
+
+    async def broadcast_model_update(self, model_data: Dict[str, Any]):
+        """Broadcast a model update to all connected devices."""
+        await self._broadcast_raw(
+            "model/update", self._encode_model(model_data), qos=MODEL_PUBLISH_QOS
+        )
 
     async def send_model_to_device(self, device_id: str, model_data: Dict[str, Any]):
         """Send model update to specific device."""
-        await self._send_to_device(device_id, "model/update", model_data)
+        await self._send_raw_to_device(
+            device_id,
+            "model/update",
+            self._encode_model(model_data),
+            qos=MODEL_PUBLISH_QOS,
+        )
 
     async def send_task_to_device(
         self, device_id: str, task_type: str, parameters: Dict[str, Any]
@@ -269,7 +629,7 @@ class EdgeInterface:
         task_message = {
             "task_type": task_type,
             "parameters": parameters,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._iso_now(),
         }
 
         await self._send_to_device(device_id, "task/assign", task_message)
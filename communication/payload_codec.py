@@ -0,0 +1,126 @@
+"""
+Payload Codec for Fog Communication.
+
+Encodes messages exchanged with edge devices. Control messages travel as
+JSON; weight-bearing messages are packed with MessagePack, with numeric
+arrays carried as raw little-endian buffers instead of lists of floats.
+"""
+
+import base64
+from typing import Any, Dict, Optional
+
+import msgpack
+import numpy as np
+import orjson
+
+# Leading byte marking a MessagePack payload. 0xc1 is never emitted by
+# MessagePack and cannot start a JSON document, so plain JSON from older
+# devices is still recognised.
+MSGPACK_TAG = b"\xc1"
+
+# Message types whose payloads carry model weights
+WEIGHT_MESSAGE_TYPES = frozenset({"model/update", "training/update"})
+
+_NDARRAY_KEY = "__ndarray__"
+
+
+def _pack_array(obj: Any) -> Any:
+    """Convert arrays and tensors into a raw-buffer map for MessagePack."""
+    if hasattr(obj, "detach") and hasattr(obj, "numpy"):  # torch.Tensor
+        obj = obj.detach().cpu().numpy()
+
+    if isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj)
+        return {
+            _NDARRAY_KEY: array.tobytes(),
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+def _unpack_array(obj: dict) -> Any:
+    """Restore arrays packed by _pack_array."""
+    if _NDARRAY_KEY in obj:
+        return np.frombuffer(obj[_NDARRAY_KEY], dtype=obj["dtype"]).reshape(
+            obj["shape"]
+        )
+    return obj
+
+
+def encode_payload(payload: Any, binary: bool = False) -> bytes:
+    """Encode a message payload, as MessagePack when ``binary`` is set."""
+    if binary:
+        return MSGPACK_TAG + msgpack.packb(
+            payload, use_bin_type=True, default=_pack_array
+        )
+    return orjson.dumps(payload)
+
+
+def decode_payload(raw: bytes) -> Any:
+    """Decode a payload produced by encode_payload or a plain JSON sender."""
+    if raw[:1] == MSGPACK_TAG:
+        return msgpack.unpackb(raw[1:], raw=False, object_hook=_unpack_array)
+    return orjson.loads(raw)
+
+
+def _bfloat16_tensor(buffer: bytes) -> Any:
+    """View little-endian bfloat16 values as a bfloat16 torch tensor."""
+    import torch
+
+    return torch.from_numpy(np.frombuffer(buffer, dtype="<i2")).view(torch.bfloat16)
+
+
+def _decode_buffer(
+    buffer: Any, dtype: str, shape: Any = -1, scale: Optional[float] = None
+) -> Any:
+    """View a raw layer buffer as an array without copying the elements."""
+    if isinstance(buffer, str):
+        buffer = base64.b64decode(buffer)
+    if dtype == "bfloat16":
+        array = _bfloat16_tensor(buffer)
+    else:
+        array = np.frombuffer(buffer, dtype=dtype)
+    array = array.reshape(shape)
+    return array if scale is None else (array, float(scale))
+
+
+def decode_weights(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the model weights of a training update as NumPy arrays.
+
+    Senders may ship ``weights_raw`` (layer name -> little-endian buffer, as
+    bytes or base64 text) with ``shapes`` and an optional ``dtype``, or
+    ``weights`` entries of the form ``{"shape", "dtype", "data"}``; legacy
+    ``weights`` lists are converted in a single pass per layer. ``dtype`` may
+    be ``"bfloat16"`` (returned as bfloat16 torch tensors), and layers listed
+    in ``scales`` are INT8-quantized and returned as ``(int8 array, scale)``
+    pairs; the aggregator only upcasts either inside its accumulator.
+    """
+    raw_weights = payload.get("weights_raw")
+    if raw_weights:
+        dtype = payload.get("dtype", "<f4")
+        shapes = payload.get("shapes", {})
+        scales = payload.get("scales", {})
+        return {
+            name: _decode_buffer(buffer, dtype, shapes.get(name, -1), scales.get(name))
+            for name, buffer in raw_weights.items()
+        }
+
+    weights = {}
+    for name, value in payload.get("weights", {}).items():
+        if isinstance(value, np.ndarray):
+            weights[name] = value
+        elif isinstance(value, dict) and "data" in value:
+            weights[name] = _decode_buffer(
+                value["data"],
+                value.get("dtype", "<f4"),
+                value.get("shape", -1),
+                value.get("scale"),
+            )
+        else:
+            weights[name] = np.asarray(value, "<f4")
+    return weights
@@ -7,16 +7,42 @@ resource sharing, and distributed coordination.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
-from dataclasses import asdict, dataclass
+import os
+import socket
+import ssl
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import aiohttp
+import orjson
 from aiohttp import ClientSession, web
 
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize a JSON body, rendering datetimes and other objects as text."""
+    return orjson.dumps(data, default=str)
+
+
+def _json_response(data: Any, status: int = 200) -> web.Response:
+    """Build a JSON response serialized with orjson."""
+    return web.Response(
+        body=_dumps(data), status=status, content_type="application/json"
+    )
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class PeerNode:
     """Information about a peer fog node."""
 
@@ -24,11 +50,22 @@ class PeerNode:
     region: str
     endpoint: str
     capabilities: Dict[str, Any]
-    last_seen: datetime
+    last_seen: float  # time.monotonic() of the last contact
     status: str = "active"  # active, inactive, unreachable
 
+    # Request URLs, built once from the endpoint
+    collaborate_url: str = field(init=False, repr=False)
+    heartbeat_url: str = field(init=False, repr=False)
+    status_url: str = field(init=False, repr=False)
 
-@dataclass
+    def __post_init__(self):
+        """Build request URLs from the endpoint."""
+        self.collaborate_url = f"{self.endpoint}/peer/collaborate"
+        self.heartbeat_url = f"{self.endpoint}/peer/heartbeat"
+        self.status_url = f"{self.endpoint}/peer/status"
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class CollaborationRequest:
     """Request for inter-fog collaboration."""
 
@@ -40,6 +77,35 @@ class CollaborationRequest:
     timestamp: datetime
     priority: int = 1  # 1=low, 5=high
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CollaborationRequest":
+        """Build a request from decoded JSON, validating field types."""
+        payload = data.get("data", {})
+        if not isinstance(payload, dict):
+            raise ValueError("'data' must be an object")
+
+        return cls(
+            request_id=str(data["request_id"]),
+            source_node=str(data["source_node"]),
+            target_node=str(data["target_node"]),
+            request_type=str(data["request_type"]),
+            data=payload,
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            priority=int(data.get("priority", 1)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the request as a flat dict for JSON encoding."""
+        return {
+            "request_id": self.request_id,
+            "source_node": self.source_node,
+            "target_node": self.target_node,
+            "request_type": self.request_type,
+            "data": self.data,
+            "timestamp": self.timestamp.isoformat(),
+            "priority": self.priority,
+        }
+
 
 class PeerInterface:
     """
@@ -64,15 +130,28 @@ class PeerInterface:
         self.discovery_enabled = config.get("discovery_enabled", True)
         self.heartbeat_interval = config.get("heartbeat_interval", 30)
 
+        # Cap concurrent outbound peer calls to avoid handshake storms on fan-out
+        self._peer_sem = asyncio.Semaphore(config.get("max_parallel_peer_requests", 32))
+
         # State management
         self.peer_nodes: Dict[str, PeerNode] = {}
+        self._peers_by_region: Dict[str, Set[str]] = defaultdict(set)
+        # (last_seen, peer_id) min-heap; stale entries are skipped on pop
+        self._expiry_heap: List[Tuple[float, str]] = []
         self.message_handlers: Dict[str, Callable] = {}
         self.collaboration_requests: Dict[str, CollaborationRequest] = {}
 
+        # Unique request ids: per-process prefix plus a counter
+        self._request_prefix = f"req_{os.getpid()}_{int(time.time())}_"
+        self._request_counter = itertools.count()
+
         # HTTP server and client
         self.app = web.Application()
-        self.server = None
+        self.runner: Optional[web.AppRunner] = None
         self.client_session: Optional[ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        # Built once so https peers reuse the loaded trust store
+        self._ssl_context = ssl.create_default_context()
 
         # Running state
         self.is_running = False
@@ -102,13 +181,34 @@ class PeerInterface:
 
         self.logger.info(f"Starting peer interface on {self.host}:{self.port}")
 
-        # Start HTTP client session
+        # Start HTTP client session; one keep-alive pool shared by all peer calls
+        self._connector = aiohttp.TCPConnector(
+            limit=self.config.get("max_connections", 256),
+            limit_per_host=self.config.get("max_connections_per_host", 32),
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+            ssl=self._ssl_context,
+        )
         self.client_session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"Connection": "keep-alive"},
+            json_serialize=lambda data: _dumps(data).decode(),
         )
 
-        # Start HTTP server
-        self.server = await aiohttp.web.create_server(self.app, self.host, self.port)
+        # Start HTTP server; accepted sockets get SO_KEEPALIVE so dead peers
+        # are reaped, and a deep backlog absorbs registration bursts
+        self.runner = web.AppRunner(self.app, tcp_keepalive=True)
+        await self.runner.setup()
+        site = web.TCPSite(
+            self.runner,
+            self.host,
+            self.port,
+            backlog=512,
+            reuse_port=hasattr(socket, "SO_REUSEPORT"),
+        )
+        await site.start()
 
         self.is_running = True
 
@@ -130,14 +230,16 @@ class PeerInterface:
 
         self.is_running = False
 
-        # Close client session
+        # Close client session (this also closes the connector it owns)
         if self.client_session:
             await self.client_session.close()
+            self.client_session = None
+            self._connector = None
 
         # Stop server
-        if self.server:
-            self.server.close()
-            await self.server.wait_closed()
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
 
         self.logger.info("Peer interface stopped")
 
@@ -154,18 +256,56 @@ class PeerInterface:
                 region=peer_info["region"],
                 endpoint=peer_info["endpoint"],
                 capabilities=peer_info.get("capabilities", {}),
-                last_seen=datetime.now(),
+                last_seen=time.monotonic(),
                 status="active",
             )
 
+            previous = self.peer_nodes.get(peer.node_id)
+            if previous is not None and previous.region != peer.region:
+                self._peers_by_region[previous.region].discard(peer.node_id)
+
             self.peer_nodes[peer.node_id] = peer
-            self.logger.info(f"Registered peer node: {peer.node_id} in {peer.region}")
+            self._peers_by_region[peer.region].add(peer.node_id)
+            heapq.heappush(self._expiry_heap, (peer.last_seen, peer.node_id))
+            self.logger.info(
+                "Registered peer node: %s in %s", peer.node_id, peer.region
+            )
 
             return True
         except Exception as e:
             self.logger.error(f"Failed to register peer: {e}")
             return False
 
+    def _touch_peer(self, peer: PeerNode):
+        """Record contact with a peer and mark it active."""
+        peer.last_seen = time.monotonic()
+        peer.status = "active"
+        heapq.heappush(self._expiry_heap, (peer.last_seen, peer.node_id))
+
+    def _expire_peers(self, threshold: float) -> List[str]:
+        """Remove peers not seen within ``threshold`` seconds."""
+        now = time.monotonic()
+        expired = []
+        while self._expiry_heap and now - self._expiry_heap[0][0] > threshold:
+            _, peer_id = heapq.heappop(self._expiry_heap)
+            peer = self.peer_nodes.get(peer_id)
+            # Peers contacted since this entry was pushed have a newer entry
+            if peer is not None and now - peer.last_seen > threshold:
+                self._remove_peer(peer_id)
+                expired.append(peer_id)
+        return expired
+
+    def _remove_peer(self, peer_id: str) -> Optional[PeerNode]:
+        """Drop a peer from the peer table and the region index."""
+        peer = self.peer_nodes.pop(peer_id, None)
+        if peer is not None:
+            region_peers = self._peers_by_region.get(peer.region)
+            if region_peers is not None:
+                region_peers.discard(peer_id)
+                if not region_peers:
+                    del self._peers_by_region[peer.region]
+        return peer
+
     async def send_collaboration_request(
         self,
         target_node: str,
@@ -174,12 +314,12 @@ class PeerInterface:
         priority: int = 1,
     ) -> Optional[str]:
         """Send collaboration request to peer node."""
-        if target_node not in self.peer_nodes:
+        peer = self.peer_nodes.get(target_node)
+        if peer is None:
             self.logger.error(f"Unknown peer node: {target_node}")
             return None
 
-        peer = self.peer_nodes[target_node]
-        request_id = f"req_{datetime.now().timestamp():.0f}"
+        request_id = f"{self._request_prefix}{next(self._request_counter)}"
 
         request = CollaborationRequest(
             request_id=request_id,
@@ -192,15 +332,15 @@ class PeerInterface:
         )
 
         try:
-            async with self.client_session.post(
-                f"{peer.endpoint}/peer/collaborate",
-                json=asdict(request),
-                headers={"Content-Type": "application/json"},
+            async with self._peer_sem, self.client_session.post(
+                peer.collaborate_url,
+                data=_dumps(request.to_dict()),
+                headers=JSON_HEADERS,
             ) as response:
                 if response.status == 200:
                     self.collaboration_requests[request_id] = request
                     self.logger.info(
-                        f"Sent collaboration request {request_id} to {target_node}"
+                        "Sent collaboration request %s to %s", request_id, target_node
                     )
                     return request_id
                 else:
@@ -261,41 +401,58 @@ class PeerInterface:
         self, region: str, message_type: str, data: Dict[str, Any]
     ):
         """Broadcast message to all peers in a specific region."""
-        region_peers = [
-            peer
-            for peer in self.peer_nodes.values()
-            if peer.region == region and peer.status == "active"
-        ]
+        await self.broadcast_messages_to_region(region, [(message_type, data)])
+
+    async def broadcast_messages_to_region(
+        self, region: str, messages: List[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """Broadcast several messages to all active peers in a region.
 
+        Each peer gets its messages in order on one task, so they reuse the
+        same keep-alive connection instead of racing for new sockets.
+        """
         tasks = []
-        for peer in region_peers:
-            task = self.send_collaboration_request(peer.node_id, message_type, data)
-            tasks.append(task)
-
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            successful = sum(
-                1 for r in results if r is not None and not isinstance(r, Exception)
-            )
-            self.logger.info(
-                f"Broadcast to {region}: {successful}/{len(tasks)} successful"
-            )
+        for peer_id in self._peers_by_region.get(region, ()):
+            peer = self.peer_nodes.get(peer_id)
+            if peer is not None and peer.status == "active":
+                tasks.append(self._send_messages_to_peer(peer_id, messages))
+
+        if not tasks:
+            return 0
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        successful = sum(r for r in results if not isinstance(r, Exception))
+        self.logger.info(
+            "Broadcast to %s: %d/%d successful",
+            region,
+            successful,
+            len(tasks) * len(messages),
+        )
+        return successful
+
+    async def _send_messages_to_peer(
+        self, peer_id: str, messages: List[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """Send messages to one peer sequentially, returning the success count."""
+        successful = 0
+        for message_type, data in messages:
+            if await self.send_collaboration_request(peer_id, message_type, data):
+                successful += 1
+        return successful
 
     async def get_peer_status(self, peer_id: str) -> Optional[Dict[str, Any]]:
         """Get status information from peer node."""
-        if peer_id not in self.peer_nodes:
+        peer = self.peer_nodes.get(peer_id)
+        if peer is None:
             return None
 
-        peer = self.peer_nodes[peer_id]
-
         try:
-            async with self.client_session.get(
-                f"{peer.endpoint}/peer/status"
+            async with self._peer_sem, self.client_session.get(
+                peer.status_url
             ) as response:
                 if response.status == 200:
-                    status_data = await response.json()
-                    peer.last_seen = datetime.now()
-                    peer.status = "active"
+                    status_data = orjson.loads(await response.read())
+                    self._touch_peer(peer)
                     return status_data
                 else:
                     peer.status = "unreachable"
@@ -311,47 +468,53 @@ class PeerInterface:
     async def _handle_peer_registration(self, request: web.Request) -> web.Response:
         """Handle peer registration request."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
             success = await self.register_peer(data)
 
             if success:
-                return web.json_response(
+                return _json_response(
                     {"status": "success", "message": "Peer registered"}
                 )
             else:
-                return web.json_response(
+                return _json_response(
                     {"status": "error", "message": "Registration failed"}, status=400
                 )
 
         except Exception as e:
             self.logger.error(f"Error in peer registration: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_heartbeat(self, request: web.Request) -> web.Response:
         """Handle heartbeat from peer node."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
             peer_id = data.get("node_id")
 
-            if peer_id in self.peer_nodes:
-                self.peer_nodes[peer_id].last_seen = datetime.now()
-                self.peer_nodes[peer_id].status = "active"
+            peer = self.peer_nodes.get(peer_id)
+            if peer is not None:
+                self._touch_peer(peer)
 
-                return web.json_response({"status": "success"})
+                return _json_response({"status": "success"})
             else:
-                return web.json_response(
+                return _json_response(
                     {"status": "error", "message": "Unknown peer"}, status=404
                 )
 
         except Exception as e:
             self.logger.error(f"Error in heartbeat handling: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_collaboration_request(self, request: web.Request) -> web.Response:
         """Handle collaboration request from peer."""
         try:
-            data = await request.json()
-            collaboration_req = CollaborationRequest(**data)
+            data = orjson.loads(await request.read())
+            try:
+                collaboration_req = CollaborationRequest.from_dict(data)
+            except (KeyError, TypeError, ValueError) as e:
+                return _json_response(
+                    {"status": "error", "message": f"Invalid request: {e}"},
+                    status=400,
+                )
 
             # Store request
             self.collaboration_requests[collaboration_req.request_id] = (
@@ -363,53 +526,53 @@ class PeerInterface:
             if handler:
                 await handler(data)
 
-            return web.json_response(
+            return _json_response(
                 {"status": "success", "request_id": collaboration_req.request_id}
             )
 
         except Exception as e:
             self.logger.error(f"Error handling collaboration request: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_resource_sharing(self, request: web.Request) -> web.Response:
         """Handle resource sharing request."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
 
             # Call resource sharing handler
             handler = self.message_handlers.get("resource_sharing")
             if handler:
                 result = await handler(data)
-                return web.json_response({"status": "success", "result": result})
+                return _json_response({"status": "success", "result": result})
             else:
-                return web.json_response(
+                return _json_response(
                     {"status": "error", "message": "No handler for resource sharing"},
                     status=501,
                 )
 
         except Exception as e:
             self.logger.error(f"Error handling resource sharing: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_model_sharing(self, request: web.Request) -> web.Response:
         """Handle model sharing request."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
 
             # Call model sharing handler
             handler = self.message_handlers.get("model_sharing")
             if handler:
                 result = await handler(data)
-                return web.json_response({"status": "success", "result": result})
+                return _json_response({"status": "success", "result": result})
             else:
-                return web.json_response(
+                return _json_response(
                     {"status": "error", "message": "No handler for model sharing"},
                     status=501,
                 )
 
         except Exception as e:
             self.logger.error(f"Error handling model sharing: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_status_request(self, request: web.Request) -> web.Response:
         """Handle status request from peer."""
@@ -422,34 +585,38 @@ class PeerInterface:
                 "status": "active",
             }
 
-            return web.json_response(status)
+            return _json_response(status)
 
         except Exception as e:
             self.logger.error(f"Error handling status request: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_peers_list(self, request: web.Request) -> web.Response:
         """Handle request for peers list."""
         try:
+            # Map monotonic contact times onto the wall clock for display
+            wall_offset = time.time() - time.monotonic()
             peers_list = [
                 {
                     "node_id": peer.node_id,
                     "region": peer.region,
                     "status": peer.status,
-                    "last_seen": peer.last_seen.isoformat(),
+                    "last_seen": datetime.fromtimestamp(
+                        peer.last_seen + wall_offset
+                    ).isoformat(),
                 }
                 for peer in self.peer_nodes.values()
             ]
 
-            return web.json_response({"peers": peers_list})
+            return _json_response({"peers": peers_list})
 
         except Exception as e:
             self.logger.error(f"Error handling peers list request: {e}")
-            return web.json_response({"status": "error", "message": str(e)}, status=500)
+            return _json_response({"status": "error", "message": str(e)}, status=500)
 
     async def _handle_health_check(self, request: web.Request) -> web.Response:
         """Handle health check request."""
-        return web.json_response(
+        return _json_response(
             {
                 "status": "healthy",
                 "timestamp": datetime.now().isoformat(),
@@ -463,9 +630,13 @@ class PeerInterface:
         """Periodic peer discovery and health checks."""
         while self.is_running:
             try:
-                # Check health of known peers
-                for peer_id in list(self.peer_nodes.keys()):
-                    await self.get_peer_status(peer_id)
+                # Check health of known peers concurrently
+                snapshot = tuple(self.peer_nodes)
+                if snapshot:
+                    await asyncio.gather(
+                        *(self.get_peer_status(peer_id) for peer_id in snapshot),
+                        return_exceptions=True,
+                    )
 
                 await asyncio.sleep(60)  # Discovery every minute
 
@@ -475,31 +646,51 @@ class PeerInterface:
 
     async def _heartbeat_loop(self):
         """Send heartbeat to all active peers."""
+        loop = asyncio.get_running_loop()
+
         while self.is_running:
+            started = loop.time()
             try:
-                heartbeat_data = {
-                    "node_id": "self",  # Will be filled with actual node ID
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "active",
-                }
-
-                for peer in self.peer_nodes.values():
-                    if peer.status == "active":
-                        try:
-                            async with self.client_session.post(
-                                f"{peer.endpoint}/peer/heartbeat", json=heartbeat_data
-                            ) as response:
-                                if response.status != 200:
-                                    peer.status = "unreachable"
-
-                        except Exception:
-                            peer.status = "unreachable"
+                # Encoded once per tick and shared by every peer post
+                heartbeat_payload = _dumps(
+                    {
+                        "node_id": "self",  # Will be filled with actual node ID
+                        "timestamp": datetime.now().isoformat(),
+                        "status": "active",
+                    }
+                )
 
-                await asyncio.sleep(self.heartbeat_interval)
+                tasks = [
+                    self._send_heartbeat(peer, heartbeat_payload)
+                    for peer in list(self.peer_nodes.values())
+                    if peer.status == "active"
+                ]
+                if tasks:
+                    # Slow peers must not push the next tick past the interval
+                    await asyncio.wait_for(
+                        asyncio.gather(*tasks, return_exceptions=True),
+                        timeout=self.heartbeat_interval * 0.8,
+                    )
 
+            except asyncio.TimeoutError:
+                self.logger.warning("Heartbeat round did not finish within interval")
             except Exception as e:
                 self.logger.error(f"Error in heartbeat loop: {e}")
-                await asyncio.sleep(self.heartbeat_interval)
+
+            elapsed = loop.time() - started
+            await asyncio.sleep(max(0.0, self.heartbeat_interval - elapsed))
+
+    async def _send_heartbeat(self, peer: PeerNode, payload: bytes):
+        """Send a heartbeat to a single peer, marking it unreachable on failure."""
+        try:
+            async with self._peer_sem, self.client_session.post(
+                peer.heartbeat_url, data=payload, headers=JSON_HEADERS
+            ) as response:
+                if response.status != 200:
+                    peer.status = "unreachable"
+
+        except Exception:
+            peer.status = "unreachable"
 
     async def _cleanup_inactive_peers(self):
         """Clean up inactive peers and old requests."""
@@ -509,15 +700,8 @@ class PeerInterface:
 
                 # Remove peers that haven't been seen for too long
                 inactive_threshold = 300  # 5 minutes
-                inactive_peers = [
-                    peer_id
-                    for peer_id, peer in self.peer_nodes.items()
-                    if (now - peer.last_seen).total_seconds() > inactive_threshold
-                ]
-
-                for peer_id in inactive_peers:
-                    del self.peer_nodes[peer_id]
-                    self.logger.info(f"Removed inactive peer: {peer_id}")
+                for peer_id in self._expire_peers(inactive_threshold):
+                    self.logger.info("Removed inactive peer: %s", peer_id)
 
                 # Remove old collaboration requests
                 old_threshold = 3600  # 1 hour
@@ -528,7 +712,7 @@ class PeerInterface:
                 ]
 
                 for req_id in old_requests:
-                    del self.collaboration_requests[req_id]
+                    self.collaboration_requests.pop(req_id, None)
 
                 await asyncio.sleep(300)  # Cleanup every 5 minutes
 
@@ -10,12 +10,14 @@ __author__ = "TFM Federated Learning Team"
 __email__ = "fl-fog@project.com"
 
 import asyncio
+import heapq
 import logging
 import signal
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -27,6 +29,9 @@ from .model_cache import ModelCache
 
 logger = logging.getLogger(__name__)
 
+# Prefer the LibYAML-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class FogNode:
     """
@@ -61,13 +66,24 @@ class FogNode:
             ),
             min_clients=config.get("aggregation", {}).get("min_clients", 3),
             max_wait_time=config.get("aggregation", {}).get("max_wait_time", 120.0),
+            device=config.get("aggregation", {}).get("device"),
+            compile_reduction=config.get("aggregation", {}).get(
+                "compile_reduction", False
+            ),
+            max_pending_updates=config.get("aggregation", {}).get(
+                "max_pending_updates"
+            ),
         )
 
         self.model_cache = ModelCache(
             cache_size=config.get("caching", {}).get("max_size_gb", 10.0),
             ttl_hours=config.get("caching", {}).get("ttl_hours", 24),
+            eviction_policy=config.get("caching", {}).get("eviction_policy", "lru"),
         )
 
+        # Maximum age of cached models served to devices (None: latest only)
+        self.model_staleness = config.get("caching", {}).get("max_staleness_seconds")
+
         # Communication interfaces
         self.edge_interface = EdgeInterface(
             mqtt_broker=config["edge_interface"]["mqtt_broker"], fog_node=self
@@ -77,11 +93,15 @@ class FogNode:
             server_url=config["cloud_interface"]["server_url"],
             sync_interval=config["cloud_interface"]["sync_interval"],
             fog_node=self,
+            grpc_pool_size=config["cloud_interface"].get("grpc_pool_size", 4),
+            max_sync_interval=config["cloud_interface"].get("max_sync_interval"),
+            batch_results=config["cloud_interface"].get("batch_results", False),
         )
 
         # State management
         self._running = False
         self._startup_time: Optional[datetime] = None
+        self._startup_monotonic = 0.0
         self._tasks: List[asyncio.Task] = []
 
         # Statistics and monitoring
@@ -103,6 +123,7 @@ class FogNode:
         try:
             self._running = True
             self._startup_time = datetime.now()
+            self._startup_monotonic = time.monotonic()
 
             logger.info(f"Starting fog node {self.node_id}...")
 
@@ -117,9 +138,8 @@ class FogNode:
             # Setup event handlers
             self._setup_event_handlers()
 
-            # Start monitoring tasks
-            self._tasks.append(asyncio.create_task(self._monitoring_loop()))
-            self._tasks.append(asyncio.create_task(self._stats_update_loop()))
+            # Start monitoring and stats jobs on a single scheduler task
+            self._tasks.append(asyncio.create_task(self._run_scheduler()))
 
             logger.info(f"Fog node {self.node_id} started successfully")
 
@@ -201,85 +221,111 @@ class FogNode:
     async def _send_cached_models_to_device(self, device_id: str) -> None:
         """Send relevant cached models to a newly connected device."""
         try:
-            # Get latest cached model
-            latest_model = await self.model_cache.get_latest_model()
-            if latest_model:
-                await self.edge_interface.send_model_to_device(device_id, latest_model)
+            if self.model_staleness:
+                # Every cached version that is still fresh, newest first
+                models = await self.model_cache.get_fresh_models(self.model_staleness)
+            else:
+                latest_model = await self.model_cache.get_latest_model()
+                models = [latest_model] if latest_model else []
+
+            for model in models:
+                await self.edge_interface.send_model_to_device(device_id, model)
         except Exception as e:
             logger.error(f"Failed to send cached model to {device_id}: {e}")
 
     async def _process_training_update(
         self, device_id: str, model_update: Dict[str, Any]
-    ) -> None:
+    ) -> bool:
         """Process a training update from an edge device."""
+        edge_update = self._to_edge_update(device_id, model_update)
+        if edge_update is None:
+            return False
+
         try:
-            # Convert to EdgeUpdate format
-            edge_update = EdgeUpdate(
+            added = await self.regional_aggregator.add_edge_update(edge_update)
+        except Exception as e:
+            logger.error(f"Failed to process training update from {device_id}: {e}")
+            return False
+
+        logger.debug(f"Processed training update from {device_id}")
+        if added:
+            self.cloud_interface.notify_change()
+        return added
+
+    def _to_edge_update(
+        self, device_id: str, model_update: Dict[str, Any]
+    ) -> Optional[EdgeUpdate]:
+        """Convert a device payload to an EdgeUpdate, or None if malformed."""
+        try:
+            return EdgeUpdate(
                 client_id=device_id,
                 model_weights=model_update["weights"],
                 sample_count=model_update["sample_count"],
                 training_loss=model_update["loss"],
                 timestamp=datetime.now(),
+                received_at=time.monotonic(),
             )
-
-            # Add to regional aggregator
-            await self.regional_aggregator.add_edge_update(edge_update)
-
-            logger.debug(f"Processed training update from {device_id}")
-
-        except Exception as e:
+        except (KeyError, TypeError) as e:
             logger.error(f"Failed to process training update from {device_id}: {e}")
+            return None
 
-    async def _monitoring_loop(self) -> None:
-        """Main monitoring and coordination loop."""
-        while self._running:
-            try:
-                # Check system health
-                await self._check_system_health()
-
-                # Trigger aggregation if needed
-                await self._check_aggregation_triggers()
-
-                # Sync with cloud if needed
-                await self._check_cloud_sync()
-
-                # Cleanup old data
-                await self._cleanup_old_data()
+    async def _run_scheduler(self) -> None:
+        """Run periodic jobs from one task, sleeping until the next one is due."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
 
-                await asyncio.sleep(30)  # Check every 30 seconds
+        # (due time, tie-breaker, interval, job, error message)
+        jobs = [
+            (now, 0, 30.0, self._run_monitoring_checks, "Error in monitoring loop"),
+            (now, 1, 60.0, self._update_stats, "Error updating stats"),
+        ]
+        heapq.heapify(jobs)
 
-            except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(30)
-
-    async def _stats_update_loop(self) -> None:
-        """Update statistics periodically."""
         while self._running:
-            try:
-                if self._startup_time:
-                    self.stats["uptime_seconds"] = (
-                        datetime.now() - self._startup_time
-                    ).total_seconds()
-
-                # Update component stats
-                coordinator_stats = self.edge_coordinator.get_coordinator_stats()
-                aggregator_stats = self.regional_aggregator.get_aggregation_stats()
-                cache_stats = await self.model_cache.get_cache_stats()
-
-                self.stats.update(
-                    {
-                        "connected_devices": coordinator_stats["total_devices"],
-                        "active_workloads": coordinator_stats["active_workloads"],
-                        "aggregation_rounds": aggregator_stats["rounds_completed"],
-                        "cache_hit_rate": cache_stats.get("hit_rate", 0.0),
-                    }
-                )
-
-                await asyncio.sleep(60)  # Update every minute
+            due, order, interval, job, error_message = heapq.heappop(jobs)
+            await asyncio.sleep(max(0.0, due - loop.time()))
 
+            try:
+                await job()
             except Exception as e:
-                logger.error(f"Error updating stats: {e}")
-                await asyncio.sleep(60)
+                logger.error(f"{error_message}: {e}")
+
+            # Keep the cadence, but never schedule a run in the past
+            next_due = max(due + interval, loop.time())
+            heapq.heappush(jobs, (next_due, order, interval, job, error_message))
+
+    async def _run_monitoring_checks(self) -> None:
+        """Main monitoring and coordination checks."""
+        # Check system health
+        await self._check_system_health()
+
+        # Trigger aggregation if needed
+        await self._check_aggregation_triggers()
+
+        # Sync with cloud if needed
+        await self._check_cloud_sync()
+
+        # Cleanup old data
+        await self._cleanup_old_data()
+
+    async def _update_stats(self) -> None:
+        """Update statistics."""
+        if self._startup_time:
+            self.stats["uptime_seconds"] = time.monotonic() - self._startup_monotonic
+
+        # Update component stats
+        coordinator_stats = self.edge_coordinator.get_coordinator_stats()
+        aggregator_stats = self.regional_aggregator.get_aggregation_stats()
+        cache_stats = await self.model_cache.get_cache_stats()
+
+        self.stats.update(
+            {
+                "connected_devices": coordinator_stats["total_devices"],
+                "active_workloads": coordinator_stats["active_workloads"],
+                "aggregation_rounds": aggregator_stats["rounds_completed"],
+                "cache_hit_rate": cache_stats.get("hit_rate", 0.0),
+            }
+        )
 
     async def _check_system_health(self) -> None:
         """Check overall system health."""
@@ -307,6 +353,8 @@ class FogNode:
     async def _cleanup_old_data(self) -> None:
         """Cleanup old data and expired cache entries."""
         await self.model_cache.cleanup_expired()
+        if self.model_staleness:
+            await self.model_cache.evict_by_staleness(self.model_staleness)
 
     # API methods for external interaction
 
@@ -314,16 +362,34 @@ class FogNode:
         self, device_id: str, device_type: str, capabilities: Dict[str, Any]
     ) -> bool:
         """Register a new edge device."""
-        return await self.edge_coordinator.register_device(
+        registered = await self.edge_coordinator.register_device(
             device_id, device_type, capabilities
         )
+        if registered:
+            self.cloud_interface.notify_change()
+        return registered
 
     async def submit_training_update(
         self, device_id: str, model_update: Dict[str, Any]
     ) -> bool:
         """Submit a training update from an edge device."""
-        await self._process_training_update(device_id, model_update)
-        return True
+        return await self._process_training_update(device_id, model_update)
+
+    async def submit_training_updates(
+        self, updates: List[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """Submit a batch of training updates and return how many were accepted."""
+        edge_updates = []
+        for device_id, model_update in updates:
+            edge_update = self._to_edge_update(device_id, model_update)
+            if edge_update is not None:
+                edge_updates.append(edge_update)
+
+        accepted = await self.regional_aggregator.add_edge_updates(edge_updates)
+
+        if accepted:
+            self.cloud_interface.notify_change()
+        return accepted
 
     async def request_model(
         self, device_id: str, model_version: Optional[str] = None
@@ -381,7 +447,7 @@ async def create_fog_node_from_config(config_path: str) -> FogNode:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
     with open(config_file, "r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YAML_LOADER)
 
     return FogNode(config)
 
@@ -427,5 +493,18 @@ async def main():
         sys.exit(1)
 
 
-if __name__ == "__main__":
+def install_uvloop() -> bool:
+    """Use uvloop for the event loop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def run() -> None:
+    """Console entry point: run the fog node, on uvloop when installed."""
+    install_uvloop()
     asyncio.run(main())
@@ -0,0 +1,7 @@
+"""
+Run the fog node with ``python -m fog_node``.
+"""
+
+from . import run
+
+run()
@@ -6,19 +6,55 @@ before forwarding to cloud aggregation services.
 """
 
 import asyncio
+import functools
+import itertools
 import logging
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
-import numpy as np
 import torch
 
 logger = logging.getLogger(__name__)
 
 
+def _mean(values: List[float]) -> float:
+    """Arithmetic mean of a short list, without a NumPy round trip."""
+    return sum(values) / len(values)
+
+
+def _variance(values: List[float]) -> float:
+    """Population variance of a short list (1.0 when undefined)."""
+    n = len(values)
+    if n < 2:
+        return 1.0
+    mean = sum(values) / n
+    return sum((x - mean) * (x - mean) for x in values) / n
+
+
+def _fused_weighted_sum(stacked: torch.Tensor, weights: torch.Tensor) -> torch.Tensor:
+    """Weighted float32 sum of the rows of an ``[N, P]`` stack, for torch.compile.
+
+    The client count is a tensor dimension rather than a Python loop, so one
+    dynamic-shape graph serves every round.
+    """
+    return (weights[:, None] * stacked.to(torch.float32)).sum(0)
+
+
+def _split_scale(value: Any) -> Tuple[torch.Tensor, float]:
+    """Return a weight as a tensor in its stored dtype, plus its scale.
+
+    ``(int8, scale)`` pairs keep their int8 payload; other weights have scale 1.
+    """
+    if isinstance(value, tuple):
+        qtensor, scale = value
+        return torch.as_tensor(qtensor), float(scale)
+    return torch.as_tensor(value), 1.0
+
+
 class AggregationStrategy(Enum):
     """Available aggregation strategies for fog layer."""
 
@@ -33,13 +69,21 @@ class EdgeUpdate:
     """Represents an update from an edge device."""
 
     client_id: str
-    model_weights: Dict[str, torch.Tensor]
+    # Tensors may be FP32, BF16/FP16 or (int8 tensor, scale) pairs
+    model_weights: Dict[str, Any]
     sample_count: int
     training_loss: float
     timestamp: datetime
     device_tier: str = "edge"
     privacy_budget: float = 1.0
     compression_ratio: float = 1.0
+    # time.monotonic() at ingress; preferred over ``timestamp`` for validation
+    received_at: Optional[float] = None
+    # All parameters in one contiguous vector, laid out by the round schema
+    # and kept in the narrowest dtype that holds every layer
+    flat_weights: Optional[torch.Tensor] = None
+    # Per-layer dequantization scales in schema order; None if all are 1
+    flat_scales: Optional[List[float]] = None
 
 
 @dataclass
@@ -52,7 +96,7 @@ class AggregationResult:
     average_loss: float
     aggregation_round: int
     fog_node_id: str
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime
 
 
 class RegionalAggregator:
@@ -73,21 +117,56 @@ class RegionalAggregator:
         min_clients: int = 3,
         max_wait_time: float = 120.0,
         aggregation_threshold: float = 0.7,
+        history_size: int = 100,
+        device: Optional[str] = None,
+        compile_reduction: bool = False,
+        max_pending_updates: Optional[int] = None,
     ):
         self.fog_node_id = fog_node_id
         self.strategy = strategy
         self.min_clients = min_clients
         self.max_wait_time = max_wait_time
         self.aggregation_threshold = aggregation_threshold
+        # Per-round cap on buffered updates; later arrivals are dropped
+        self.max_pending_updates = max_pending_updates or 10 * min_clients
+
+        # Aggregation math runs on the GPU when one is available
+        self.device = torch.device(
+            device or ("cuda" if torch.cuda.is_available() else "cpu")
+        )
 
         # Aggregation state
         self.current_round = 0
         self.pending_updates: List[EdgeUpdate] = []
-        self.aggregation_history: List[AggregationResult] = []
+        self._pending_client_ids: Set[str] = set()
+
+        # Sample-weighted running sum of FedAvg updates, folded in on arrival
+        self._running_sum: Dict[str, torch.Tensor] = {}
+        self._running_samples = 0
+
+        # Layout of flattened updates: name -> (offset, length, shape)
+        self._schema: Optional[Dict[str, Tuple[int, int, Tuple[int, ...]]]] = None
+        self.aggregation_history: Deque[AggregationResult] = deque(maxlen=history_size)
+        self.rounds_completed = 0
+        self.dropped_updates = 0
+        self._stats_cache: Optional[Tuple[Tuple[int, ...], Dict[str, Any]]] = None
 
         # Timing and coordination
         self.round_start_time: Optional[datetime] = None
+        self._round_start_monotonic = 0.0
+        self._round_complete_time: Optional[datetime] = None
         self.aggregation_task: Optional[asyncio.Task] = None
+        # Set whenever an update arrives while min_clients are pending
+        self._enough_clients = asyncio.Event()
+
+        # Optionally specialize the flat-vector reduction with torch.compile
+        # (PyTorch 2.x); shapes are fixed for a training run
+        self._fused_reduce = None
+        if compile_reduction:
+            if hasattr(torch, "compile"):
+                self._fused_reduce = torch.compile(_fused_weighted_sum, dynamic=True)
+            else:
+                logger.warning("torch.compile unavailable, using eager reduction")
 
         # Strategy-specific parameters
         self.fedprox_mu = 0.1  # Proximal term weight
@@ -103,7 +182,13 @@ class RegionalAggregator:
 
         self.current_round += 1
         self.round_start_time = datetime.now()
+        self._round_start_monotonic = time.monotonic()
         self.pending_updates.clear()
+        self._pending_client_ids.clear()
+        self._running_sum.clear()
+        self._running_samples = 0
+        self._schema = None
+        self._enough_clients.clear()
 
         logger.info(f"Started aggregation round {self.current_round}")
 
@@ -113,16 +198,25 @@ class RegionalAggregator:
     async def _coordinate_aggregation(self) -> None:
         """Coordinate the aggregation process with timing constraints."""
         try:
-            start_time = time.time()
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.max_wait_time
+
+            # Wake up on each update once enough clients have reported
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
 
-            while time.time() - start_time < self.max_wait_time:
-                # Check if we have enough clients
-                if len(self.pending_updates) >= self.min_clients:
-                    # Check if we should trigger early aggregation
-                    if await self._should_trigger_aggregation():
-                        break
+                try:
+                    await asyncio.wait_for(self._enough_clients.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
 
-                await asyncio.sleep(1.0)  # Check every second
+                self._enough_clients.clear()
+
+                # Check if we should trigger early aggregation
+                if await self._should_trigger_aggregation():
+                    break
 
             # Perform aggregation if we have any updates
             if self.pending_updates:
@@ -136,6 +230,20 @@ class RegionalAggregator:
 
     async def add_edge_update(self, update: EdgeUpdate) -> bool:
         """Add an edge device update to the current aggregation round."""
+        return self._add_update(update)
+
+    async def add_edge_updates(self, updates: List[EdgeUpdate]) -> int:
+        """Add a batch of updates in one pass and return how many were accepted."""
+        accepted = 0
+        for update in updates:
+            try:
+                accepted += self._add_update(update)
+            except Exception as e:
+                logger.error(f"Failed to add update from {update.client_id}: {e}")
+        return accepted
+
+    def _add_update(self, update: EdgeUpdate) -> bool:
+        """Validate an update and fold it into the current round."""
         if not self.round_start_time:
             logger.warning("No active aggregation round")
             return False
@@ -145,8 +253,29 @@ class RegionalAggregator:
             logger.warning(f"Invalid update from client {update.client_id}")
             return False
 
+        # Drop valid arrivals once the round is full; already-accepted updates
+        # may be folded into the running sum, so they are kept
+        if len(self.pending_updates) >= self.max_pending_updates:
+            self.dropped_updates += 1
+            logger.warning(
+                f"Round {self.current_round} full, dropped update from "
+                f"{update.client_id}"
+            )
+            return False
+
+        if self._streams_updates():
+            accepted = self._accumulate(update)
+        else:
+            accepted = self._flatten(update)
+        if not accepted:
+            logger.warning(f"Model layout mismatch from client {update.client_id}")
+            return False
+
         # Add to pending updates
         self.pending_updates.append(update)
+        self._pending_client_ids.add(update.client_id)
+        if len(self.pending_updates) >= self.min_clients:
+            self._enough_clients.set()
         logger.debug(
             f"Added update from {update.client_id} ({len(self.pending_updates)} total)"
         )
@@ -156,7 +285,10 @@ class RegionalAggregator:
     def _validate_update(self, update: EdgeUpdate) -> bool:
         """Validate an incoming edge update."""
         # Check timestamp
-        if self.round_start_time and update.timestamp < self.round_start_time:
+        if update.received_at is not None:
+            if update.received_at < self._round_start_monotonic:
+                return False
+        elif self.round_start_time and update.timestamp < self.round_start_time:
             return False
 
         # Check model weights structure
@@ -168,8 +300,7 @@ class RegionalAggregator:
             return False
 
         # Check for duplicate client in this round
-        client_ids = [u.client_id for u in self.pending_updates]
-        if update.client_id in client_ids:
+        if update.client_id in self._pending_client_ids:
             logger.warning(f"Duplicate update from client {update.client_id}")
             return False
 
@@ -198,7 +329,7 @@ class RegionalAggregator:
 
         # Check loss convergence
         losses = [u.training_loss for u in self.pending_updates]
-        loss_variance = np.var(losses) if len(losses) > 1 else 1.0
+        loss_variance = _variance(losses)
         convergence_threshold = (
             loss_variance < 0.1
         )  # Low variance indicates convergence
@@ -209,21 +340,25 @@ class RegionalAggregator:
 
     async def _perform_aggregation(self) -> AggregationResult:
         """Perform the actual aggregation based on selected strategy."""
+        # Read the clock once per round; the result reuses this timestamp
+        self._round_complete_time = datetime.now()
         logger.info(
             f"Performing {self.strategy.value} aggregation with "
             f"{len(self.pending_updates)} updates"
         )
 
-        if self.strategy == AggregationStrategy.FEDAVG:
-            aggregated_weights = self._fedavg_aggregation()
-        elif self.strategy == AggregationStrategy.FEDPROX:
-            aggregated_weights = self._fedprox_aggregation()
-        elif self.strategy == AggregationStrategy.REGIONAL:
-            aggregated_weights = self._regional_aggregation()
-        elif self.strategy == AggregationStrategy.ADAPTIVE:
-            aggregated_weights = self._adaptive_aggregation()
-        else:
-            raise ValueError(f"Unknown aggregation strategy: {self.strategy}")
+        # No gradients are taken in the fog layer, so skip autograd tracking
+        with torch.inference_mode():
+            if self.strategy == AggregationStrategy.FEDAVG:
+                aggregated_weights = self._fedavg_aggregation()
+            elif self.strategy == AggregationStrategy.FEDPROX:
+                aggregated_weights = self._fedprox_aggregation()
+            elif self.strategy == AggregationStrategy.REGIONAL:
+                aggregated_weights = self._regional_aggregation()
+            elif self.strategy == AggregationStrategy.ADAPTIVE:
+                aggregated_weights = self._adaptive_aggregation()
+            else:
+                raise ValueError(f"Unknown aggregation strategy: {self.strategy}")
 
         # Calculate statistics
         total_samples = sum(u.sample_count for u in self.pending_updates)
@@ -240,65 +375,177 @@ class RegionalAggregator:
             average_loss=average_loss,
             aggregation_round=self.current_round,
             fog_node_id=self.fog_node_id,
+            created_at=self._round_complete_time,
         )
 
         self.aggregation_history.append(result)
+        self.rounds_completed += 1
         return result
 
-    def _fedavg_aggregation(self) -> Dict[str, torch.Tensor]:
-        """Standard FedAvg aggregation: weighted average by sample count."""
-        total_samples = sum(u.sample_count for u in self.pending_updates)
-        aggregated_weights = {}
+    def recent_results(self, count: int) -> List[AggregationResult]:
+        """Return up to the last ``count`` aggregation results, oldest first."""
+        history = self.aggregation_history
+        return list(itertools.islice(history, max(0, len(history) - count), None))
 
-        # Get all parameter names from first update
-        param_names = list(self.pending_updates[0].model_weights.keys())
+    def _streams_updates(self) -> bool:
+        """Whether the strategy can fold updates into a running sum."""
+        return self.strategy in (
+            AggregationStrategy.FEDAVG,
+            AggregationStrategy.REGIONAL,
+        )
 
-        for param_name in param_names:
-            weighted_sum = None
+    def _match_schema(
+        self, update: EdgeUpdate
+    ) -> Optional[List[Tuple[torch.Tensor, float]]]:
+        """Return an update's (tensor, scale) pairs in schema order.
+
+        The first update of a round fixes the layer names and shapes; None is
+        returned for updates that do not match it.
+        """
+        names = list(self._schema or update.model_weights)
+        if set(update.model_weights) != set(names):
+            return None
+
+        layers = [_split_scale(update.model_weights[name]) for name in names]
+        schema = {}
+        offset = 0
+        for name, (tensor, _) in zip(names, layers):
+            schema[name] = (offset, tensor.numel(), tuple(tensor.shape))
+            offset += tensor.numel()
+
+        if self._schema is None:
+            self._schema = schema
+        elif schema != self._schema:
+            return None
+        return layers
+
+    @torch.inference_mode()
+    def _accumulate(self, update: EdgeUpdate) -> bool:
+        """Fold an update into the running sum and release its weights.
+
+        Updates that do not match the round's layout are rejected before
+        anything is added.
+        """
+        layers = self._match_schema(update)
+        if layers is None:
+            return False
 
-            for update in self.pending_updates:
-                weight = update.sample_count / total_samples
-                param_tensor = update.model_weights[param_name]
+        for name, (tensor, scale) in zip(self._schema, layers):
+            running = self._running_sum.get(name)
+            if running is None:
+                running = torch.zeros(
+                    tensor.shape, dtype=torch.float32, device=self.device
+                )
+                self._running_sum[name] = running
+            # Low-precision payloads are only upcast in the accumulator
+            running.add_(
+                tensor.to(self.device, non_blocking=True),
+                alpha=update.sample_count * scale,
+            )
+
+        self._running_samples += update.sample_count
+        # Only the metadata is needed from here on
+        update.model_weights = {}
+        return True
 
-                if weighted_sum is None:
-                    weighted_sum = weight * param_tensor
-                else:
-                    weighted_sum += weight * param_tensor
+    def _flatten(self, update: EdgeUpdate) -> bool:
+        """Pack an update's parameters into one contiguous vector.
 
-            aggregated_weights[param_name] = weighted_sum
+        Updates that do not match the round's layout are rejected.
+        """
+        layers = self._match_schema(update)
+        if layers is None:
+            return False
 
-        return aggregated_weights
+        # Uniform BF16 or INT8 updates stay compact until the reduction
+        dtype = functools.reduce(torch.promote_types, (t.dtype for t, _ in layers))
+        flat = torch.cat([tensor.reshape(-1).to(dtype) for tensor, _ in layers])
+        if self.device.type == "cuda":
+            # Pinned host memory lets the copy to the GPU run asynchronously
+            flat = flat.pin_memory()
+
+        update.flat_weights = flat
+        scales = [scale for _, scale in layers]
+        update.flat_scales = scales if any(scale != 1.0 for scale in scales) else None
+        update.model_weights = {}
+        return True
 
-    def _fedprox_aggregation(self) -> Dict[str, torch.Tensor]:
-        """FedProx aggregation with proximal term."""
-        # For fog layer, we use modified FedProx that considers device heterogeneity
-        total_samples = sum(u.sample_count for u in self.pending_updates)
-        aggregated_weights = {}
+    @torch.inference_mode()
+    def _weighted_sum(self, client_weights: List[float]) -> Dict[str, torch.Tensor]:
+        """Weighted sum of the flattened pending updates, split into parameters.
 
-        param_names = list(self.pending_updates[0].model_weights.keys())
+        ``client_weights`` holds one weight per pending update, in order.
+        """
+        tensors = [
+            update.flat_weights.to(self.device, non_blocking=True)
+            for update in self.pending_updates
+        ]
 
-        for param_name in param_names:
-            weighted_sum = None
+        scaled = any(update.flat_scales for update in self.pending_updates)
 
-            for update in self.pending_updates:
-                # Adjust weight based on device characteristics
-                base_weight = update.sample_count / total_samples
+        if self._fused_reduce is not None and not scaled:
+            dtype = functools.reduce(torch.promote_types, (t.dtype for t in tensors))
+            stacked = torch.stack([tensor.to(dtype) for tensor in tensors])
+            weights = torch.tensor(client_weights, device=self.device)
+            flat = self._fused_reduce(stacked, weights)
+        else:
+            # Low-precision payloads are only upcast in the accumulator
+            is_double = any(tensor.dtype == torch.float64 for tensor in tensors)
+            flat = torch.zeros(
+                tensors[0].numel(),
+                dtype=torch.float64 if is_double else torch.float32,
+                device=self.device,
+            )
+            segments = list(self._schema.values())
+            for update, tensor, weight in zip(
+                self.pending_updates, tensors, client_weights
+            ):
+                if update.flat_scales is None:
+                    flat.add_(tensor, alpha=weight)
+                    continue
+                # Quantized layers are scaled segment by segment
+                for (offset, length, _), scale in zip(segments, update.flat_scales):
+                    flat[offset : offset + length].add_(
+                        tensor[offset : offset + length], alpha=weight * scale
+                    )
+
+        # Separate tensors per parameter, so each can be stored on its own
+        flat = flat.cpu()
+        return {
+            name: flat[offset : offset + length].view(shape).clone()
+            for name, (offset, length, shape) in self._schema.items()
+        }
 
-                # Apply proximal adjustment (reduce weight for outliers)
-                # This is a simplified version - full FedProx would need global model
-                prox_adjustment = 1.0 / (1.0 + self.fedprox_mu * update.training_loss)
-                adjusted_weight = base_weight * prox_adjustment
+    def _fedavg_aggregation(self) -> Dict[str, torch.Tensor]:
+        """Standard FedAvg aggregation: weighted average by sample count."""
+        if self._running_samples:
+            return {
+                name: (weighted_sum / self._running_samples).cpu()
+                for name, weighted_sum in self._running_sum.items()
+            }
 
-                param_tensor = update.model_weights[param_name]
+        total_samples = sum(u.sample_count for u in self.pending_updates)
 
-                if weighted_sum is None:
-                    weighted_sum = adjusted_weight * param_tensor
-                else:
-                    weighted_sum += adjusted_weight * param_tensor
+        return self._weighted_sum(
+            [update.sample_count / total_samples for update in self.pending_updates]
+        )
+
+    def _fedprox_aggregation(self) -> Dict[str, torch.Tensor]:
+        """FedProx aggregation with proximal term."""
+        # For fog layer, we use modified FedProx that considers device heterogeneity
+        total_samples = sum(u.sample_count for u in self.pending_updates)
+        client_weights = []
 
-            aggregated_weights[param_name] = weighted_sum
+        for update in self.pending_updates:
+            # Adjust weight based on device characteristics
+            base_weight = update.sample_count / total_samples
 
-        return aggregated_weights
+            # Apply proximal adjustment (reduce weight for outliers)
+            # This is a simplified version - full FedProx would need global model
+            prox_adjustment = 1.0 / (1.0 + self.fedprox_mu * update.training_loss)
+            client_weights.append(base_weight * prox_adjustment)
+
+        return self._weighted_sum(client_weights)
 
     def _regional_aggregation(self) -> Dict[str, torch.Tensor]:
         """Region-aware aggregation considering geographic locality."""
@@ -309,41 +556,27 @@ class RegionalAggregator:
     def _adaptive_aggregation(self) -> Dict[str, torch.Tensor]:
         """Adaptive aggregation based on runtime characteristics."""
         total_samples = sum(u.sample_count for u in self.pending_updates)
-        aggregated_weights = {}
+        client_weights = []
 
-        param_names = list(self.pending_updates[0].model_weights.keys())
+        for update in self.pending_updates:
+            # Adaptive weight based on multiple factors
+            base_weight = update.sample_count / total_samples
 
-        for param_name in param_names:
-            weighted_sum = None
+            # Quality factor based on training loss
+            loss_factor = 1.0 / (1.0 + update.training_loss)
 
-            for update in self.pending_updates:
-                # Adaptive weight based on multiple factors
-                base_weight = update.sample_count / total_samples
+            # Privacy factor (higher privacy budget = lower weight)
+            privacy_factor = 1.0 / (1.0 + update.privacy_budget)
 
-                # Quality factor based on training loss
-                loss_factor = 1.0 / (1.0 + update.training_loss)
+            # Compression factor
+            compression_factor = update.compression_ratio
 
-                # Privacy factor (higher privacy budget = lower weight)
-                privacy_factor = 1.0 / (1.0 + update.privacy_budget)
+            # Combine factors
+            client_weights.append(
+                base_weight * loss_factor * privacy_factor * compression_factor
+            )
 
-                # Compression factor
-                compression_factor = update.compression_ratio
-
-                # Combine factors
-                adaptive_weight = (
-                    base_weight * loss_factor * privacy_factor * compression_factor
-                )
-
-                param_tensor = update.model_weights[param_name]
-
-                if weighted_sum is None:
-                    weighted_sum = adaptive_weight * param_tensor
-                else:
-                    weighted_sum += adaptive_weight * param_tensor
-
-            aggregated_weights[param_name] = weighted_sum
-
-        return aggregated_weights
+        return self._weighted_sum(client_weights)
 
     async def _handle_aggregation_result(self, result: AggregationResult) -> None:
         """Handle the aggregation result (logging, forwarding, etc.)."""
@@ -365,22 +598,30 @@ class RegionalAggregator:
         if not self.aggregation_history:
             return {"rounds_completed": 0}
 
-        recent_results = self.aggregation_history[-10:]  # Last 10 rounds
+        # Only recomputed after a round completes or a new one starts
+        cache_key = (self.rounds_completed, self.current_round, self.dropped_updates)
+        if self._stats_cache is not None and self._stats_cache[0] == cache_key:
+            return dict(self._stats_cache[1])
 
-        return {
-            "rounds_completed": len(self.aggregation_history),
+        recent_results = self.recent_results(10)  # Last 10 rounds
+
+        stats = {
+            "rounds_completed": self.rounds_completed,
             "current_round": self.current_round,
-            "avg_clients_per_round": np.mean(
+            "dropped_updates": self.dropped_updates,
+            "avg_clients_per_round": _mean(
                 [len(r.participating_clients) for r in recent_results]
             ),
-            "avg_samples_per_round": np.mean([r.total_samples for r in recent_results]),
-            "avg_loss": np.mean([r.average_loss for r in recent_results]),
+            "avg_samples_per_round": _mean([r.total_samples for r in recent_results]),
+            "avg_loss": _mean([r.average_loss for r in recent_results]),
             "last_aggregation": (
                 self.aggregation_history[-1].created_at.isoformat()
                 if self.aggregation_history
                 else None
             ),
         }
+        self._stats_cache = (cache_key, stats)
+        return dict(stats)
 
     async def cleanup(self) -> None:
         """Cleanup resources and cancel ongoing tasks."""
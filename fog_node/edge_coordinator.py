@@ -6,15 +6,41 @@ for edge devices connected to this fog node.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
+import os
+import random
+import sys
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Workload types with dedicated capability rules, each served from a ready heap
+WORKLOAD_TYPES = ("training", "inference", "data_collection")
+
+# Workload statuses that still occupy a device
+ACTIVE_WORKLOAD_STATUSES = ("assigned", "running")
+
+# Finished workloads kept for lookups by id
+WORKLOAD_HISTORY_SIZE = 10_000
+
+# Matching cost for workload/device pairs that cannot be assigned
+_INFEASIBLE_COST = 1e9
+
+# Timed-out devices unregistered per event-loop turn during a health check
+HEALTH_CHECK_BATCH_SIZE = 16
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class EdgeDeviceStatus(Enum):
     """Status of edge devices."""
@@ -27,7 +53,30 @@ class EdgeDeviceStatus(Enum):
     LOW_BATTERY = "low_battery"
 
 
-@dataclass
+# Statuses in which a device accepts new workloads. A tuple, not a frozenset:
+# membership short-circuits on identity, while Enum hashing runs Python code.
+AVAILABLE_STATUSES = (EdgeDeviceStatus.ONLINE, EdgeDeviceStatus.IDLE)
+
+
+@lru_cache(maxsize=1024)
+def _workload_fits(fingerprint: Tuple[Any, Any, bool], workload_type: str) -> bool:
+    """Capability rules per workload type, memoized on the device fingerprint."""
+    memory_gb, cpu_cores, has_sensors = fingerprint
+
+    # Basic capability checks based on workload type
+    if workload_type == "training":
+        return memory_gb >= 1.0 and cpu_cores >= 1
+
+    elif workload_type == "inference":
+        return cpu_cores >= 1
+
+    elif workload_type == "data_collection":
+        return has_sensors
+
+    return True  # Default: assume device can handle unknown workload types
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class EdgeDeviceInfo:
     """Information about an edge device."""
 
@@ -35,14 +84,20 @@ class EdgeDeviceInfo:
     device_type: str  # smartphone, raspberry_pi, smartwatch, etc.
     capabilities: Dict[str, Any]
     status: EdgeDeviceStatus
-    last_seen: datetime
-    connected_at: datetime
+    last_seen: float  # time.monotonic() of the last status report
+    connected_at: float  # time.monotonic()
     current_workload: Optional[str] = None
     performance_metrics: Dict[str, float] = field(default_factory=dict)
     location: Optional[Dict[str, float]] = None  # lat, lng if available
+    # Capability part of the device score; capabilities are fixed at registration
+    _static_score: float = field(default=0.0, init=False, repr=False)
+    # (memory_gb, cpu_cores, has_sensors): the inputs of the workload rules
+    _fingerprint: Tuple[Any, Any, bool] = field(
+        default=(0, 0, False), init=False, repr=False
+    )
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class WorkloadAssignment:
     """Workload assignment to an edge device."""
 
@@ -50,8 +105,8 @@ class WorkloadAssignment:
     device_id: str
     workload_type: str  # "training", "inference", "data_collection"
     parameters: Dict[str, Any]
-    assigned_at: datetime
-    expected_completion: datetime
+    assigned_at: float  # time.monotonic()
+    expected_completion: float  # time.monotonic() deadline
     status: str = "assigned"  # assigned, running, completed, failed
 
 
@@ -73,20 +128,81 @@ class EdgeCoordinator:
         max_edge_devices: int = 50,
         health_check_interval: float = 30.0,
         device_timeout: float = 300.0,
+        max_interval: float = 300.0,
+        selection_temperature: Optional[float] = None,
+        rng: Optional[np.random.Generator] = None,
     ):
         self.fog_node_id = fog_node_id
         self.max_edge_devices = max_edge_devices
         self.health_check_interval = health_check_interval
         self.device_timeout = device_timeout
+        # Upper bound for the monitoring interval while nothing changes
+        self.max_interval = max(max_interval, health_check_interval)
+        # Softmax temperature for sampling devices by score; None picks the
+        # best device greedily. Small values stay close to greedy.
+        self.selection_temperature = selection_temperature
+        self._rng = rng if rng is not None else np.random.default_rng()
 
         # Device management
         self.connected_devices: Dict[str, EdgeDeviceInfo] = {}
+        # Assigned and running workloads; finished ones move to the history
         self.workload_assignments: Dict[str, WorkloadAssignment] = {}
+        self.workload_history: Deque[WorkloadAssignment] = deque(
+            maxlen=WORKLOAD_HISTORY_SIZE
+        )
+        # Timers that fire at each active workload's expected completion
+        self._timeout_handles: Dict[str, asyncio.TimerHandle] = {}
+        # Device id -> ids of its active workloads
+        self._device_workloads: Dict[str, Set[str]] = {}
         self.device_groups: Dict[str, Set[str]] = {}  # Group devices by type/capability
 
+        # Counters kept current on every transition so stats are O(1)
+        self._status_counts: Dict[EdgeDeviceStatus, int] = {
+            status: 0 for status in EdgeDeviceStatus
+        }
+
+        # Workload ids: a per-process prefix plus a counter, unique across restarts
+        self._workload_prefix = f"workload_{os.getpid()}_{int(time.time())}_"
+        self._workload_counter = itertools.count()
+
+        # Per workload type, a (-score, version, device_id) heap of devices that
+        # were available when pushed; entries with an old version are skipped
+        self._ready_heaps: Dict[str, List[Tuple[float, int, str]]] = {
+            workload_type: [] for workload_type in WORKLOAD_TYPES
+        }
+        self._device_version: Dict[str, int] = {}
+        self._version_counter = itertools.count(1)
+        # Workload type -> devices whose capabilities can handle it
+        self._capable_devices: Dict[str, Set[str]] = {
+            workload_type: set() for workload_type in WORKLOAD_TYPES
+        }
+
+        # Scoring inputs as parallel arrays, one row per connected device, so
+        # candidate sets are scored in a single vectorized pass
+        self._soa: Dict[str, np.ndarray] = {
+            "static": np.zeros(max_edge_devices),
+            "avg_cpu": np.zeros(max_edge_devices),
+            "avg_memory": np.zeros(max_edge_devices),
+            "has_metrics": np.zeros(max_edge_devices, dtype=bool),
+        }
+        self._device_slots: Dict[str, int] = {}
+        self._free_slots = list(range(max_edge_devices - 1, -1, -1))
+
+        # (last_seen, device_id) min-heap; stale entries are skipped on pop
+        self._last_seen_heap: List[Tuple[float, str]] = []
+
+        # Serializes compound check-then-write updates of devices and workloads.
+        # Callbacks are notified after release, so listeners may call back in.
+        self._state_lock = asyncio.Lock()
+
         # Monitoring and coordination
         self._monitoring_task: Optional[asyncio.Task] = None
         self._running = False
+        # Fraction of the interval by which each monitoring tick is randomized,
+        # so fog nodes started together do not sweep in lockstep
+        self._jitter = 0.1
+        # Consecutive monitoring ticks that found nothing to do
+        self._idle_ticks = 0
 
         # Callbacks for events
         self.event_callbacks: Dict[str, List[Callable]] = {
@@ -96,7 +212,7 @@ class EdgeCoordinator:
             "device_overloaded": [],
         }
 
-        logger.info(f"Edge coordinator initialized for fog node {fog_node_id}")
+        logger.info("Edge coordinator initialized for fog node %s", fog_node_id)
 
     async def start(self) -> None:
         """Start the edge coordinator."""
@@ -116,6 +232,11 @@ class EdgeCoordinator:
                 await self._monitoring_task
             except asyncio.CancelledError:
                 pass
+
+        for handle in self._timeout_handles.values():
+            handle.cancel()
+        self._timeout_handles.clear()
+
         logger.info("Edge coordinator stopped")
 
     async def register_device(
@@ -126,31 +247,46 @@ class EdgeCoordinator:
         location: Optional[Dict[str, float]] = None,
     ) -> bool:
         """Register a new edge device."""
-        if len(self.connected_devices) >= self.max_edge_devices:
-            logger.warning(f"Maximum device limit reached, rejecting {device_id}")
-            return False
-
-        if device_id in self.connected_devices:
-            logger.warning(f"Device {device_id} already registered")
-            return False
+        async with self._state_lock:
+            if len(self.connected_devices) >= self.max_edge_devices:
+                logger.warning("Maximum device limit reached, rejecting %s", device_id)
+                return False
 
-        now = datetime.now()
-        device_info = EdgeDeviceInfo(
-            device_id=device_id,
-            device_type=device_type,
-            capabilities=capabilities,
-            status=EdgeDeviceStatus.ONLINE,
-            last_seen=now,
-            connected_at=now,
-            location=location,
-        )
+            if device_id in self.connected_devices:
+                logger.warning("Device %s already registered", device_id)
+                return False
+
+            now = time.monotonic()
+            device_info = EdgeDeviceInfo(
+                device_id=device_id,
+                device_type=device_type,
+                capabilities=capabilities,
+                status=EdgeDeviceStatus.ONLINE,
+                last_seen=now,
+                connected_at=now,
+                location=location,
+            )
+            device_info._static_score = self._compute_static_score(capabilities)
+            device_info._fingerprint = (
+                capabilities.get("memory_gb", 0),
+                capabilities.get("cpu_cores", 0),
+                capabilities.get("sensors", []) != [],
+            )
 
-        self.connected_devices[device_id] = device_info
+            self.connected_devices[device_id] = device_info
+            self._status_counts[device_info.status] += 1
+            self._device_slots[device_id] = self._free_slots.pop()
+            for workload_type, capable in self._capable_devices.items():
+                if self._can_handle_workload(device_info, workload_type):
+                    capable.add(device_id)
+            self._store_scoring_row(device_info)
+            self._refresh_ready(device_info)
+            self._push_last_seen(device_info)
 
-        # Add to appropriate groups
-        self._update_device_groups(device_id, device_type)
+            # Add to appropriate groups
+            self._update_device_groups(device_id, device_type)
 
-        logger.info(f"Registered edge device {device_id} ({device_type})")
+        logger.info("Registered edge device %s (%s)", device_id, device_type)
 
         # Notify callbacks
         await self._notify_callbacks("device_connected", device_info)
@@ -159,21 +295,26 @@ class EdgeCoordinator:
 
     async def unregister_device(self, device_id: str) -> bool:
         """Unregister an edge device."""
-        if device_id not in self.connected_devices:
-            return False
-
-        device_info = self.connected_devices[device_id]
+        async with self._state_lock:
+            device_info = self.connected_devices.get(device_id)
+            if device_info is None:
+                return False
 
-        # Cancel any active workloads
-        await self._cancel_device_workloads(device_id)
+            # Cancel any active workloads
+            await self._cancel_device_workloads(device_id)
 
-        # Remove from groups
-        self._remove_from_device_groups(device_id)
+            # Remove from groups
+            self._remove_from_device_groups(device_id)
 
-        # Remove from connected devices
-        del self.connected_devices[device_id]
+            # Remove from connected devices
+            del self.connected_devices[device_id]
+            self._status_counts[device_info.status] -= 1
+            self._device_version.pop(device_id, None)
+            for capable in self._capable_devices.values():
+                capable.discard(device_id)
+            self._free_slots.append(self._device_slots.pop(device_id))
 
-        logger.info(f"Unregistered edge device {device_id}")
+        logger.info("Unregistered edge device %s", device_id)
 
         # Notify callbacks
         await self._notify_callbacks("device_disconnected", device_info)
@@ -187,23 +328,52 @@ class EdgeCoordinator:
         metrics: Optional[Dict[str, float]] = None,
     ) -> bool:
         """Update device status and performance metrics."""
-        if device_id not in self.connected_devices:
-            return False
-
-        device_info = self.connected_devices[device_id]
-        device_info.status = status
-        device_info.last_seen = datetime.now()
+        return (
+            await self.update_device_status_batch([(device_id, status, metrics)]) == 1
+        )
 
-        if metrics:
-            device_info.performance_metrics.update(metrics)
+    async def update_device_status_batch(
+        self,
+        updates: List[Tuple[str, EdgeDeviceStatus, Optional[Dict[str, float]]]],
+    ) -> int:
+        """Apply several device status updates at once.
+
+        Returns the number of updates that matched a connected device.
+        """
+        now = time.monotonic()
+        applied = 0
+        overloaded = []
+
+        async with self._state_lock:
+            for device_id, status, metrics in updates:
+                device_info = self.connected_devices.get(device_id)
+                if device_info is None:
+                    continue
+
+                device_info.last_seen = now
+                self._push_last_seen(device_info)
+
+                if metrics:
+                    device_info.performance_metrics.update(metrics)
+                    self._store_scoring_row(device_info)
+                self._set_device_status(device_info, status)
+
+                # Handle status-specific actions
+                if status == EdgeDeviceStatus.OVERLOADED:
+                    logger.warning("Device %s is overloaded", device_id)
+                    # Cancel non-critical workloads if any
+                    await self._cancel_device_workloads(device_id, critical_only=False)
+                    overloaded.append(device_id)
+                elif status == EdgeDeviceStatus.LOW_BATTERY:
+                    await self._handle_low_battery_device(device_id)
+
+                applied += 1
 
-        # Handle status-specific actions
-        if status == EdgeDeviceStatus.OVERLOADED:
+        # Notify callbacks
+        for device_id in overloaded:
             await self._handle_overloaded_device(device_id)
-        elif status == EdgeDeviceStatus.LOW_BATTERY:
-            await self._handle_low_battery_device(device_id)
 
-        return True
+        return applied
 
     async def assign_workload(
         self,
@@ -213,39 +383,154 @@ class EdgeCoordinator:
         priority: int = 0,
     ) -> Optional[str]:
         """Assign a workload to the best available edge device."""
+        async with self._state_lock:
+            if (
+                device_filter is None
+                and workload_type in self._ready_heaps
+                and not self.selection_temperature
+            ):
+                # Fast path: the best available device is at the top of the heap
+                best_device = self._pop_ready_device(workload_type)
+            else:
+                # Filters, sampling and unknown workload types need a full scan
+                candidates = self._find_suitable_devices(workload_type, device_filter)
+                best_device = self._select_optimal_device(
+                    candidates, workload_type, parameters
+                )
+
+            if not best_device:
+                logger.warning(
+                    "No suitable devices found for workload %s", workload_type
+                )
+                return None
+
+            workload_id = self._create_assignment(
+                best_device, workload_type, parameters
+            )
 
-        # Find suitable devices
-        candidates = self._find_suitable_devices(workload_type, device_filter)
-
-        if not candidates:
-            logger.warning(f"No suitable devices found for workload {workload_type}")
-            return None
-
-        # Select best device using multi-criteria optimization
-        best_device = self._select_optimal_device(candidates, workload_type, parameters)
-
-        if not best_device:
-            return None
+        logger.info("Assigned workload %s to device %s", workload_id, best_device)
+        return workload_id
 
-        # Create workload assignment
-        workload_id = f"workload_{int(time.time())}_{best_device}"
+    async def assign_workloads_batch(
+        self, workloads: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Optional[str]]:
+        """Assign a burst of (workload_type, parameters) requests in one matching.
+
+        Devices are matched to workloads by a single assignment solve that
+        maximizes the total device score, instead of greedily one at a time.
+        Returns a workload id per request, or None where no device was left.
+        """
+        if len(workloads) <= 1:
+            return [
+                await self.assign_workload(workload_type, parameters)
+                for workload_type, parameters in workloads
+            ]
+
+        from scipy.optimize import linear_sum_assignment
+
+        workload_ids: List[Optional[str]] = [None] * len(workloads)
+        async with self._state_lock:
+            device_ids = [
+                device_id
+                for device_id, device_info in self.connected_devices.items()
+                if device_info.status in AVAILABLE_STATUSES
+            ]
+            if not device_ids:
+                logger.warning("No available devices for workload batch")
+                return workload_ids
+
+            slots = np.fromiter(
+                (self._device_slots[device_id] for device_id in device_ids),
+                dtype=np.intp,
+                count=len(device_ids),
+            )
+            scores = self._score_slots(slots)
+
+            cost = np.full((len(workloads), len(device_ids)), _INFEASIBLE_COST)
+            for row, (workload_type, _) in enumerate(workloads):
+                capable = self._capable_devices.get(workload_type)
+                for col, device_id in enumerate(device_ids):
+                    if capable is None or device_id in capable:
+                        cost[row, col] = -scores[col]
+
+            for row, col in zip(*linear_sum_assignment(cost)):
+                if cost[row, col] >= _INFEASIBLE_COST:
+                    continue
+                workload_type, parameters = workloads[row]
+                workload_ids[row] = self._create_assignment(
+                    device_ids[col], workload_type, parameters
+                )
+
+        assigned = sum(1 for workload_id in workload_ids if workload_id)
+        logger.info("Assigned %d/%d workloads in batch", assigned, len(workloads))
+        return workload_ids
+
+    def _create_assignment(
+        self, device_id: str, workload_type: str, parameters: Dict[str, Any]
+    ) -> str:
+        """Record a new workload on a device and mark the device busy."""
+        now = time.monotonic()
+        workload_id = f"{self._workload_prefix}{next(self._workload_counter)}"
         assignment = WorkloadAssignment(
             workload_id=workload_id,
-            device_id=best_device,
+            device_id=device_id,
             workload_type=workload_type,
             parameters=parameters,
-            assigned_at=datetime.now(),
-            expected_completion=datetime.now()
-            + timedelta(seconds=300),  # Default 5 min
+            assigned_at=now,
+            expected_completion=now + 300.0,  # Default 5 min
         )
 
         self.workload_assignments[workload_id] = assignment
-        self.connected_devices[best_device].current_workload = workload_id
-        self.connected_devices[best_device].status = EdgeDeviceStatus.BUSY
-
-        logger.info(f"Assigned workload {workload_id} to device {best_device}")
+        self._device_workloads.setdefault(device_id, set()).add(workload_id)
+        self._timeout_handles[workload_id] = asyncio.get_running_loop().call_later(
+            assignment.expected_completion - now,
+            self._on_workload_deadline,
+            workload_id,
+        )
+        device_info = self.connected_devices[device_id]
+        device_info.current_workload = workload_id
+        self._set_device_status(device_info, EdgeDeviceStatus.BUSY)
         return workload_id
 
+    def _pop_ready_device(self, workload_type: str) -> Optional[str]:
+        """Pop the highest-scoring available device from a ready heap."""
+        heap = self._ready_heaps[workload_type]
+        while heap:
+            _, version, device_id = heapq.heappop(heap)
+            device_info = self.connected_devices.get(device_id)
+            if (
+                device_info is not None
+                and self._device_version.get(device_id) == version
+                and device_info.status in AVAILABLE_STATUSES
+            ):
+                return device_id
+        return None
+
+    def _refresh_ready(self, device_info: EdgeDeviceInfo) -> None:
+        """Invalidate a device's heap entries and re-push it if available."""
+        device_id = device_info.device_id
+        version = next(self._version_counter)
+        self._device_version[device_id] = version
+
+        if device_info.status not in AVAILABLE_STATUSES:
+            return
+
+        # The score does not depend on the workload, so compute it once
+        score = self._calculate_device_score(device_info, "", {})
+        for workload_type, heap in self._ready_heaps.items():
+            if device_id not in self._capable_devices[workload_type]:
+                continue
+            heapq.heappush(heap, (-score, version, device_id))
+
+            # Drop stale entries once they outnumber the live ones
+            if len(heap) > 2 * len(self.connected_devices) + 32:
+                heap[:] = [
+                    entry
+                    for entry in heap
+                    if self._device_version.get(entry[2]) == entry[1]
+                ]
+                heapq.heapify(heap)
+
     def _find_suitable_devices(
         self,
         workload_type: str,
@@ -254,16 +539,17 @@ class EdgeCoordinator:
         """Find devices suitable for the given workload."""
         candidates = []
 
-        for device_id, device_info in self.connected_devices.items():
-            # Check basic availability
-            if device_info.status not in [
-                EdgeDeviceStatus.ONLINE,
-                EdgeDeviceStatus.IDLE,
-            ]:
-                continue
+        # Capabilities are fixed at registration, so known workload types only
+        # need to visit the devices indexed as capable
+        capable = self._capable_devices.get(workload_type)
+        if capable is None:
+            capable = self.connected_devices
+
+        for device_id in capable:
+            device_info = self.connected_devices[device_id]
 
-            # Check if device can handle this workload type
-            if not self._can_handle_workload(device_info, workload_type):
+            # Check basic availability
+            if device_info.status not in AVAILABLE_STATUSES:
                 continue
 
             # Apply custom filter if provided
@@ -278,21 +564,7 @@ class EdgeCoordinator:
         self, device_info: EdgeDeviceInfo, workload_type: str
     ) -> bool:
         """Check if device can handle the specified workload type."""
-        capabilities = device_info.capabilities
-
-        # Basic capability checks based on workload type
-        if workload_type == "training":
-            min_memory = capabilities.get("memory_gb", 0)
-            min_cpu = capabilities.get("cpu_cores", 0)
-            return min_memory >= 1.0 and min_cpu >= 1
-
-        elif workload_type == "inference":
-            return capabilities.get("cpu_cores", 0) >= 1
-
-        elif workload_type == "data_collection":
-            return capabilities.get("sensors", []) != []
-
-        return True  # Default: assume device can handle unknown workload types
+        return _workload_fits(device_info._fingerprint, workload_type)
 
     def _select_optimal_device(
         self, candidates: List[str], workload_type: str, parameters: Dict[str, Any]
@@ -301,18 +573,41 @@ class EdgeCoordinator:
         if not candidates:
             return None
 
-        best_device = None
-        best_score = -1
-
-        for device_id in candidates:
-            device_info = self.connected_devices[device_id]
-            score = self._calculate_device_score(device_info, workload_type, parameters)
-
-            if score > best_score:
-                best_score = score
-                best_device = device_id
-
-        return best_device
+        slots = np.fromiter(
+            (self._device_slots[device_id] for device_id in candidates),
+            dtype=np.intp,
+            count=len(candidates),
+        )
+        scores = self._score_slots(slots)
+
+        if self.selection_temperature:
+            # Sample with p ~ exp(score / T) so load spreads past the top device
+            weights = np.exp((scores - scores.max()) / self.selection_temperature)
+            choice = self._rng.choice(len(candidates), p=weights / weights.sum())
+            return candidates[int(choice)]
+
+        # argmax keeps the first of equal scores, like a strict ">" scan
+        return candidates[int(np.argmax(scores))]
+
+    def _score_slots(self, slots: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_device_score over device rows."""
+        soa = self._soa
+        performance = (
+            1.0
+            - np.abs(soa["avg_cpu"][slots] - 0.6)
+            - np.abs(soa["avg_memory"][slots] - 0.6)
+        ) * 30
+        dynamic = np.where(soa["has_metrics"][slots], np.maximum(performance, 0), 0)
+        return soa["static"][slots] + dynamic
+
+    def _store_scoring_row(self, device_info: EdgeDeviceInfo) -> None:
+        """Copy a device's scoring inputs into its row of the scoring arrays."""
+        slot = self._device_slots[device_info.device_id]
+        metrics = device_info.performance_metrics
+        self._soa["static"][slot] = device_info._static_score
+        self._soa["avg_cpu"][slot] = metrics.get("avg_cpu_usage", 50) / 100.0
+        self._soa["avg_memory"][slot] = metrics.get("avg_memory_usage", 50) / 100.0
+        self._soa["has_metrics"][slot] = bool(metrics)
 
     def _calculate_device_score(
         self,
@@ -321,22 +616,17 @@ class EdgeCoordinator:
         parameters: Dict[str, Any],
     ) -> float:
         """Calculate a score for device suitability."""
-        score = 0.0
-        capabilities = device_info.capabilities
-        metrics = device_info.performance_metrics
+        return device_info._static_score + self._compute_dynamic_score(
+            device_info.performance_metrics
+        )
 
+    @staticmethod
+    def _compute_static_score(capabilities: Dict[str, Any]) -> float:
+        """Score the fixed resources of a device (0-90 points)."""
         # Resource availability (0-40 points)
         cpu_score = min(capabilities.get("cpu_cores", 1) / 2.0, 1.0) * 20
         memory_score = min(capabilities.get("memory_gb", 1) / 4.0, 1.0) * 20
-        score += cpu_score + memory_score
-
-        # Performance history (0-30 points)
-        if metrics:
-            avg_cpu = metrics.get("avg_cpu_usage", 50) / 100.0
-            avg_memory = metrics.get("avg_memory_usage", 50) / 100.0
-            # Prefer devices with moderate resource usage (not too high, not too low)
-            performance_score = (1.0 - abs(avg_cpu - 0.6) - abs(avg_memory - 0.6)) * 30
-            score += max(performance_score, 0)
+        score = cpu_score + memory_score
 
         # Battery level (0-20 points) for mobile devices
         battery_level = capabilities.get("battery_level", 100)
@@ -353,20 +643,33 @@ class EdgeCoordinator:
 
         return score
 
+    @staticmethod
+    def _compute_dynamic_score(metrics: Dict[str, float]) -> float:
+        """Score the reported performance history of a device (0-30 points)."""
+        if not metrics:
+            return 0.0
+
+        avg_cpu = metrics.get("avg_cpu_usage", 50) / 100.0
+        avg_memory = metrics.get("avg_memory_usage", 50) / 100.0
+        # Prefer devices with moderate resource usage (not too high, not too low)
+        performance_score = (1.0 - abs(avg_cpu - 0.6) - abs(avg_memory - 0.6)) * 30
+        return max(performance_score, 0)
+
     async def complete_workload(self, workload_id: str, result: Dict[str, Any]) -> bool:
         """Mark a workload as completed."""
-        if workload_id not in self.workload_assignments:
-            return False
+        async with self._state_lock:
+            assignment = self.get_workload(workload_id)
+            if assignment is None:
+                return False
 
-        assignment = self.workload_assignments[workload_id]
-        assignment.status = "completed"
-
-        device_id = assignment.device_id
-        if device_id in self.connected_devices:
-            self.connected_devices[device_id].current_workload = None
-            self.connected_devices[device_id].status = EdgeDeviceStatus.IDLE
+            device_id = assignment.device_id
+            # Late results of cancelled or failed workloads are still reported,
+            # but their device has already been released
+            if assignment.status in ACTIVE_WORKLOAD_STATUSES:
+                self._release_device(device_id)
+            self._finish_workload(assignment, "completed")
 
-        logger.info(f"Workload {workload_id} completed on device {device_id}")
+        logger.info("Workload %s completed on device %s", workload_id, device_id)
 
         # Notify callbacks
         await self._notify_callbacks(
@@ -376,67 +679,89 @@ class EdgeCoordinator:
         return True
 
     async def _monitoring_loop(self) -> None:
-        """Main monitoring loop for device health and workload status."""
+        """Main monitoring loop for device health."""
         while self._running:
             try:
-                await self._check_device_health()
-                await self._check_workload_timeouts()
-                await asyncio.sleep(self.health_check_interval)
+                if await self._check_device_health():
+                    self._idle_ticks = 0
+                else:
+                    self._idle_ticks = min(self._idle_ticks + 1, 16)
+                await asyncio.sleep(self._jittered(self._next_check_delay()))
             except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(self.health_check_interval)
+                logger.error("Error in monitoring loop: %s", e)
+                await asyncio.sleep(self._jittered(self.health_check_interval))
+
+    def _next_check_delay(self) -> float:
+        """Back off while ticks are idle, but wake up for the next device expiry."""
+        delay = min(self.health_check_interval * 2**self._idle_ticks, self.max_interval)
+        if self._last_seen_heap:
+            next_expiry = (
+                self._last_seen_heap[0][0] + self.device_timeout - time.monotonic()
+            )
+            delay = min(delay, max(next_expiry, self.health_check_interval))
+        return delay
 
-    async def _check_device_health(self) -> None:
-        """Check health of all connected devices."""
-        now = datetime.now()
-        disconnected_devices = []
+    def _jittered(self, interval: float) -> float:
+        """Randomize an interval by up to ``self._jitter`` either way."""
+        return interval * (1 + random.uniform(-self._jitter, self._jitter))
 
-        for device_id, device_info in self.connected_devices.items():
-            time_since_last_seen = (now - device_info.last_seen).total_seconds()
+    async def _check_device_health(self) -> int:
+        """Check health of all connected devices and return how many expired."""
+        now = time.monotonic()
+        heap = self._last_seen_heap
+        disconnected_devices = []
 
-            if time_since_last_seen > self.device_timeout:
+        # Only entries older than the timeout are visited
+        while heap and now - heap[0][0] > self.device_timeout:
+            last_seen, device_id = heapq.heappop(heap)
+            device_info = self.connected_devices.get(device_id)
+            # Devices seen since this entry was pushed have a newer entry
+            if (
+                device_info is not None
+                and device_info.last_seen == last_seen
+                and device_id not in disconnected_devices
+            ):
                 disconnected_devices.append(device_id)
-                logger.warning(f"Device {device_id} timed out")
+                logger.warning("Device %s timed out", device_id)
 
-        # Remove timed out devices
-        for device_id in disconnected_devices:
+        # Remove timed out devices, yielding between batches so a mass
+        # timeout does not stall assignments and telemetry
+        for i, device_id in enumerate(disconnected_devices):
+            if i and i % HEALTH_CHECK_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
             await self.unregister_device(device_id)
 
-    async def _check_workload_timeouts(self) -> None:
-        """Check for timed out workloads."""
-        now = datetime.now()
-        timed_out_workloads = []
+        return len(disconnected_devices)
 
-        for workload_id, assignment in self.workload_assignments.items():
-            if assignment.status == "running" and now > assignment.expected_completion:
-                timed_out_workloads.append(workload_id)
+    def _on_workload_deadline(self, workload_id: str) -> None:
+        """Fail a workload still active at its expected completion time.
 
-        for workload_id in timed_out_workloads:
-            logger.warning(f"Workload {workload_id} timed out")
-            assignment = self.workload_assignments[workload_id]
-            assignment.status = "failed"
+        The deadline covers the whole assignment: a workload the device never
+        reported as started is as overdue as one that stalled while running,
+        so both are failed once and the device is released.
+        """
+        self._timeout_handles.pop(workload_id, None)
+        assignment = self.workload_assignments.get(workload_id)
+        if assignment is None:
+            return
 
-            # Free up the device
-            device_id = assignment.device_id
-            if device_id in self.connected_devices:
-                self.connected_devices[device_id].current_workload = None
-                self.connected_devices[device_id].status = EdgeDeviceStatus.IDLE
+        logger.warning("Workload %s timed out", workload_id)
+        self._finish_workload(assignment, "failed")
 
-    async def _handle_overloaded_device(self, device_id: str) -> None:
-        """Handle an overloaded device."""
-        logger.warning(f"Device {device_id} is overloaded")
+        # Free up the device
+        self._release_device(assignment.device_id)
 
-        # Cancel non-critical workloads if any
-        await self._cancel_device_workloads(device_id, critical_only=False)
+    async def _handle_overloaded_device(self, device_id: str) -> None:
+        """Notify callbacks about an overloaded device, if still connected."""
+        device_info = self.connected_devices.get(device_id)
+        if device_info is None:
+            return
 
-        # Notify callbacks
-        await self._notify_callbacks(
-            "device_overloaded", self.connected_devices[device_id]
-        )
+        await self._notify_callbacks("device_overloaded", device_info)
 
     async def _handle_low_battery_device(self, device_id: str) -> None:
         """Handle a device with low battery."""
-        logger.warning(f"Device {device_id} has low battery")
+        logger.warning("Device %s has low battery", device_id)
 
         # Reduce workload or migrate to other devices
         await self._cancel_device_workloads(device_id, critical_only=True)
@@ -447,26 +772,80 @@ class EdgeCoordinator:
         """Cancel workloads for a specific device."""
         cancelled_workloads = []
 
-        for workload_id, assignment in self.workload_assignments.items():
-            if assignment.device_id == device_id and assignment.status in [
-                "assigned",
-                "running",
-            ]:
-                if critical_only and assignment.parameters.get("priority", 0) > 5:
-                    continue  # Keep critical workloads
+        for workload_id in self._device_workloads.get(device_id, ()):
+            assignment = self.workload_assignments[workload_id]
+            if critical_only and assignment.parameters.get("priority", 0) > 5:
+                continue  # Keep critical workloads
+
+            cancelled_workloads.append(assignment)
 
-                assignment.status = "cancelled"
-                cancelled_workloads.append(workload_id)
+        for assignment in cancelled_workloads:
+            self._finish_workload(assignment, "cancelled")
 
         if cancelled_workloads:
             logger.info(
-                f"Cancelled {len(cancelled_workloads)} workloads for device {device_id}"
+                "Cancelled %d workloads for device %s",
+                len(cancelled_workloads),
+                device_id,
             )
 
         # Update device status
-        if device_id in self.connected_devices:
-            self.connected_devices[device_id].current_workload = None
-            self.connected_devices[device_id].status = EdgeDeviceStatus.IDLE
+        self._release_device(device_id)
+
+    def _release_device(self, device_id: str) -> None:
+        """Mark a device idle with no current workload, if still connected."""
+        device_info = self.connected_devices.get(device_id)
+        if device_info is not None:
+            device_info.current_workload = None
+            self._set_device_status(device_info, EdgeDeviceStatus.IDLE)
+
+    def _set_device_status(
+        self, device_info: EdgeDeviceInfo, status: EdgeDeviceStatus
+    ) -> None:
+        """Change a device's status, keeping counters and ready heaps in sync."""
+        self._status_counts[device_info.status] -= 1
+        self._status_counts[status] += 1
+        device_info.status = status
+        self._refresh_ready(device_info)
+
+    def _finish_workload(self, assignment: WorkloadAssignment, status: str) -> None:
+        """Move a workload to a final status and into the bounded history."""
+        if assignment.status in ACTIVE_WORKLOAD_STATUSES:
+            del self.workload_assignments[assignment.workload_id]
+            handle = self._timeout_handles.pop(assignment.workload_id, None)
+            if handle is not None:
+                handle.cancel()
+            device_workloads = self._device_workloads.get(assignment.device_id)
+            if device_workloads is not None:
+                device_workloads.discard(assignment.workload_id)
+                if not device_workloads:
+                    del self._device_workloads[assignment.device_id]
+            self.workload_history.append(assignment)
+        assignment.status = status
+
+    def get_workload(self, workload_id: str) -> Optional[WorkloadAssignment]:
+        """Look up a workload among active ones first, then the history."""
+        assignment = self.workload_assignments.get(workload_id)
+        if assignment is not None:
+            return assignment
+
+        for assignment in reversed(self.workload_history):
+            if assignment.workload_id == workload_id:
+                return assignment
+        return None
+
+    def _push_last_seen(self, device_info: EdgeDeviceInfo) -> None:
+        """Record a device's last_seen in the expiry heap."""
+        heap = self._last_seen_heap
+        heapq.heappush(heap, (device_info.last_seen, device_info.device_id))
+
+        # Rebuild from the live devices once stale entries dominate
+        if len(heap) > 2 * len(self.connected_devices) + 32:
+            heap[:] = [
+                (info.last_seen, info.device_id)
+                for info in self.connected_devices.values()
+            ]
+            heapq.heapify(heap)
 
     def _update_device_groups(self, device_id: str, device_type: str) -> None:
         """Update device groups for efficient lookup."""
@@ -481,14 +860,24 @@ class EdgeCoordinator:
 
     async def _notify_callbacks(self, event_type: str, data: Any) -> None:
         """Notify registered callbacks about events."""
+        coroutines = []
         for callback in self.event_callbacks.get(event_type, []):
+            if asyncio.iscoroutinefunction(callback):
+                coroutines.append(callback(data))
+                continue
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(data)
-                else:
-                    callback(data)
+                callback(data)
             except Exception as e:
-                logger.error(f"Error in callback for {event_type}: {e}")
+                logger.error("Error in callback for %s: %s", event_type, e)
+
+        if not coroutines:
+            return
+
+        # Run async listeners concurrently so the slowest one bounds the fanout
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error in callback for %s: %s", event_type, result)
 
     def add_event_callback(self, event_type: str, callback: Callable) -> None:
         """Add a callback for specific events."""
@@ -497,33 +886,15 @@ class EdgeCoordinator:
 
     def get_coordinator_stats(self) -> Dict[str, Any]:
         """Get coordinator statistics for monitoring."""
-        online_devices = sum(
-            1
-            for d in self.connected_devices.values()
-            if d.status == EdgeDeviceStatus.ONLINE
-        )
-        busy_devices = sum(
-            1
-            for d in self.connected_devices.values()
-            if d.status == EdgeDeviceStatus.BUSY
-        )
-
-        active_workloads = sum(
-            1
-            for w in self.workload_assignments.values()
-            if w.status in ["assigned", "running"]
-        )
-
-        device_types = {}
-        for device_info in self.connected_devices.values():
-            device_type = device_info.device_type
-            device_types[device_type] = device_types.get(device_type, 0) + 1
-
         return {
             "total_devices": len(self.connected_devices),
-            "online_devices": online_devices,
-            "busy_devices": busy_devices,
-            "active_workloads": active_workloads,
-            "device_types": device_types,
+            "online_devices": self._status_counts[EdgeDeviceStatus.ONLINE],
+            "busy_devices": self._status_counts[EdgeDeviceStatus.BUSY],
+            "active_workloads": len(self.workload_assignments),
+            "device_types": {
+                device_type: len(device_ids)
+                for device_type, device_ids in self.device_groups.items()
+                if device_ids
+            },
             "fog_node_id": self.fog_node_id,
         }
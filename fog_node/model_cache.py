@@ -6,15 +6,125 @@ to reduce communication overhead and improve response times.
 """
 
 import asyncio
+import hashlib
+import heapq
 import logging
 import pickle
+import struct
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Protocol 5 lets contiguous arrays travel as out-of-band buffers
+PICKLE_PROTOCOL = 5
+
+# Leading bytes of the persistence format: a header record, then one
+# _write_serialized record per entry. Older cache files are plain pickles.
+_PERSIST_MAGIC = b"FLFOGMC2"
+
+# Longest sleep of the background cleanup loop, in seconds
+CLEANUP_INTERVAL = 300.0
+
+
+def _serialize(data: Any) -> Tuple[bytes, List[pickle.PickleBuffer]]:
+    """Pickle data, keeping large contiguous buffers out of the pickle stream."""
+    buffers: List[pickle.PickleBuffer] = []
+    blob = pickle.dumps(data, protocol=PICKLE_PROTOCOL, buffer_callback=buffers.append)
+    return blob, buffers
+
+
+def _write_serialized(f: BinaryIO, data: Any) -> None:
+    """Write a length-prefixed pickle followed by its out-of-band buffers."""
+    blob, buffers = _serialize(data)
+    f.write(struct.pack("<QI", len(blob), len(buffers)))
+    f.write(blob)
+    for buffer in buffers:
+        raw = buffer.raw()
+        f.write(struct.pack("<Q", raw.nbytes))
+        f.write(raw)
+
+
+def _read_serialized(f: BinaryIO) -> Any:
+    """Read an object written by _write_serialized."""
+    blob_size, buffer_count = struct.unpack("<QI", f.read(12))
+    blob = f.read(blob_size)
+    buffers = []
+    for _ in range(buffer_count):
+        (size,) = struct.unpack("<Q", f.read(8))
+        # bytearray keeps the restored arrays writable
+        buffer = bytearray(size)
+        f.readinto(buffer)
+        buffers.append(buffer)
+    return pickle.loads(blob, buffers=buffers)
+
+
+def _write_cache_file(path: Path, header: Dict[str, Any], records: List[Any]) -> None:
+    """Write a cache snapshot, streaming layers and entries one at a time."""
+    with open(path, "wb") as f:
+        f.write(_PERSIST_MAGIC)
+        _write_serialized(f, header)
+        for record in records:
+            _write_serialized(f, record)
+
+
+def _read_cache_file(path: Path) -> Dict[str, Any]:
+    """Read a cache file in the streamed format or as a legacy pickle."""
+    with open(path, "rb") as f:
+        if f.read(len(_PERSIST_MAGIC)) != _PERSIST_MAGIC:
+            f.seek(0)
+            return pickle.load(f)
+
+        cache_data = _read_serialized(f)
+        cache_data["blob_store"] = {}
+        for _ in range(cache_data.get("blob_count", 0)):
+            digest, value, refcount = _read_serialized(f)
+            cache_data["blob_store"][digest] = (value, refcount)
+        cache_data["cache"] = {}
+        for _ in cache_data["access_order"]:
+            entry = _read_serialized(f)
+            cache_data["cache"][entry.key] = entry
+        return cache_data
+
+
+def _estimate_size(data: Any) -> int:
+    """Approximate the size of cached data, pickling only small leaves."""
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, memoryview):
+        return data.nbytes
+    if isinstance(data, dict):
+        return sum(len(str(key)) + _estimate_size(value) for key, value in data.items())
+    if hasattr(data, "element_size") and hasattr(data, "nelement"):  # torch.Tensor
+        return data.element_size() * data.nelement()
+    if hasattr(data, "nbytes"):  # NumPy arrays
+        return int(data.nbytes)
+    if (
+        isinstance(data, (list, tuple))
+        and data
+        and not isinstance(data[0], (int, float))
+    ):
+        return sum(_estimate_size(item) for item in data)
+
+    # Scalars, strings and flat numeric lists
+    return len(pickle.dumps(data, protocol=PICKLE_PROTOCOL))
+
+
+def _layer_digest(value: Any) -> bytes:
+    """Content hash of a model layer, covering dtype and shape for arrays."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(value.data if value.flags.c_contiguous else value.tobytes())
+    else:
+        digest.update(pickle.dumps(value, protocol=PICKLE_PROTOCOL))
+    return digest.digest()
+
 
 @dataclass
 class CacheEntry:
@@ -23,11 +133,20 @@ class CacheEntry:
     key: str
     data: Any
     size_bytes: int
-    created_at: datetime
-    last_accessed: datetime
+    created_at: float  # time.monotonic()
+    last_accessed: float  # time.monotonic()
     access_count: int
-    ttl: Optional[timedelta] = None
+    ttl: Optional[float] = None  # seconds
     metadata: Dict[str, Any] = None
+    # Layer name -> _blob_store digest for deduplicated model weights
+    layer_refs: Optional[Dict[str, bytes]] = None
+    # Epoch seconds of creation, used to rebase created_at after a reload
+    wall_created_at: Optional[float] = None
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Monotonic time at which the entry expires, if it has a TTL."""
+        return self.created_at + self.ttl if self.ttl else None
 
 
 class ModelCache:
@@ -47,19 +166,42 @@ class ModelCache:
         cache_size: float = 10.0,  # GB
         ttl_hours: float = 24.0,
         persistence_path: Optional[str] = None,
+        eviction_policy: str = "lru",
     ):
+        if eviction_policy not in ("lru", "none"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
         self.max_size_bytes = int(
             cache_size * 1024 * 1024 * 1024
         )  # Convert GB to bytes
-        self.default_ttl = timedelta(hours=ttl_hours)
+        self.default_ttl = ttl_hours * 3600.0  # seconds
         self.persistence_path = Path(persistence_path) if persistence_path else None
+        # "lru": TTL expiry plus LRU eviction when full; "none": warm-cache
+        # mode, entries never expire and inserts that do not fit are rejected
+        self.eviction_policy = eviction_policy
 
         # Cache storage
         self.cache: Dict[str, CacheEntry] = {}
         self.current_size = 0
 
         # Access tracking
-        self.access_order: List[str] = []  # For LRU
+        # Keys from least to most recently used; O(1) moves and pops
+        self.access_order: "OrderedDict[str, None]" = OrderedDict()
+
+        # Content-addressed model layers shared across versions:
+        # digest -> (layer, number of entries referencing it)
+        self._blob_store: Dict[bytes, Tuple[Any, int]] = {}
+        # Cache key -> reassembled weights of a layered entry, so every read
+        # returns the same object; kept in memory only, never persisted
+        self._assembled: Dict[str, Dict[str, Any]] = {}
+
+        # Min-heap of (expires_at, key); entries replaced or removed since
+        # they were pushed are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+
+        # Cache key of the latest version of each model; pinned against
+        # expiry and eviction so it is always served from memory
+        self._latest_models: Dict[str, str] = {}
         self.stats = {"hits": 0, "misses": 0, "evictions": 0, "total_requests": 0}
 
         # Background tasks
@@ -105,14 +247,13 @@ class ModelCache:
         self,
         key: str,
         data: Any,
-        ttl: Optional[timedelta] = None,
+        ttl: Optional[float] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Store data in cache."""
         try:
-            # Serialize data to calculate size
-            serialized_data = pickle.dumps(data)
-            size_bytes = len(serialized_data)
+            # Weight buffers are measured directly instead of pickled
+            size_bytes = _estimate_size(data)
 
             # Check if data fits in cache
             if size_bytes > self.max_size_bytes:
@@ -121,28 +262,12 @@ class ModelCache:
 
             # Make space if needed
             await self._make_space(size_bytes)
+            if self.current_size + size_bytes > self.max_size_bytes:
+                logger.warning(f"No room in cache for {key} ({size_bytes} bytes)")
+                return False
 
-            # Create cache entry
-            now = datetime.now()
-            entry = CacheEntry(
-                key=key,
-                data=data,
-                size_bytes=size_bytes,
-                created_at=now,
-                last_accessed=now,
-                access_count=0,
-                ttl=ttl or self.default_ttl,
-                metadata=metadata or {},
-            )
-
-            # Remove existing entry if present
-            if key in self.cache:
-                await self._remove_entry(key)
-
-            # Add new entry
-            self.cache[key] = entry
+            await self._insert_entry(key, data, size_bytes, ttl, metadata)
             self.current_size += size_bytes
-            self.access_order.append(key)
 
             logger.debug(f"Cached {key} ({size_bytes} bytes)")
             return True
@@ -151,6 +276,125 @@ class ModelCache:
             logger.error(f"Failed to cache {key}: {e}")
             return False
 
+    async def _put_layers(
+        self,
+        key: str,
+        weights: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Store model weights with layers shared by content hash."""
+        try:
+            layer_refs = {name: _layer_digest(value) for name, value in weights.items()}
+            size_bytes = self._acquire_layers(weights, layer_refs)
+
+            # Layers are referenced before evicting, so only the bytes this
+            # version introduced have to be made room for
+            await self._make_space(0)
+            if self.current_size > self.max_size_bytes:
+                self._release_layers(layer_refs)
+                logger.warning(f"No room in cache for {key} ({size_bytes} bytes)")
+                return False
+
+            await self._insert_entry(
+                key, None, size_bytes, None, metadata, layer_refs=layer_refs
+            )
+
+            logger.debug(f"Cached {key} ({size_bytes} new bytes)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to cache {key}: {e}")
+            return False
+
+    async def _insert_entry(
+        self,
+        key: str,
+        data: Any,
+        size_bytes: int,
+        ttl: Optional[float],
+        metadata: Optional[Dict[str, Any]],
+        layer_refs: Optional[Dict[str, bytes]] = None,
+    ) -> None:
+        """Add an entry, replacing any existing entry for the key."""
+        now = time.monotonic()
+        entry = CacheEntry(
+            key=key,
+            data=data,
+            size_bytes=size_bytes,
+            created_at=now,
+            last_accessed=now,
+            access_count=0,
+            ttl=ttl or self.default_ttl,
+            metadata=metadata or {},
+            layer_refs=layer_refs,
+            wall_created_at=time.time(),
+        )
+
+        # Remove existing entry if present
+        if key in self.cache:
+            await self._remove_entry(key)
+
+        self.cache[key] = entry
+        self.access_order[key] = None
+        self._push_expiry(key, entry)
+
+    def _push_expiry(self, key: str, entry: CacheEntry) -> None:
+        """Schedule an entry for expiry by cleanup_expired."""
+        if entry.ttl and self.eviction_policy != "none":
+            heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+
+    def _acquire_layers(
+        self, weights: Dict[str, Any], layer_refs: Dict[str, bytes]
+    ) -> int:
+        """Reference the given layers, returning the bytes of new ones."""
+        added_bytes = 0
+        for name, digest in layer_refs.items():
+            if digest in self._blob_store:
+                layer, refcount = self._blob_store[digest]
+                self._blob_store[digest] = (layer, refcount + 1)
+            else:
+                self._blob_store[digest] = (weights[name], 1)
+                added_bytes += _estimate_size(weights[name])
+
+        self.current_size += added_bytes
+        return added_bytes
+
+    def _release_layers(self, layer_refs: Dict[str, bytes]) -> None:
+        """Drop references to layers, freeing those no entry uses."""
+        for digest in layer_refs.values():
+            layer, refcount = self._blob_store[digest]
+            if refcount > 1:
+                self._blob_store[digest] = (layer, refcount - 1)
+            else:
+                del self._blob_store[digest]
+                self.current_size -= _estimate_size(layer)
+
+    def _reclaimable_bytes(self, entry: CacheEntry) -> int:
+        """Bytes freed by removing an entry, ignoring layers shared elsewhere."""
+        if entry.layer_refs is None:
+            return entry.size_bytes
+
+        reclaimable = 0
+        for digest in entry.layer_refs.values():
+            layer, refcount = self._blob_store[digest]
+            if refcount == 1:
+                reclaimable += _estimate_size(layer)
+        return reclaimable
+
+    def _entry_data(self, entry: CacheEntry) -> Any:
+        """Return an entry's data, reassembling deduplicated model weights."""
+        if entry.layer_refs is None:
+            return entry.data
+
+        assembled = self._assembled.get(entry.key)
+        if assembled is None:
+            assembled = {
+                name: self._blob_store[digest][0]
+                for name, digest in entry.layer_refs.items()
+            }
+            self._assembled[entry.key] = assembled
+        return assembled
+
     async def get(self, key: str) -> Optional[Any]:
         """Retrieve data from cache."""
         self.stats["total_requests"] += 1
@@ -160,26 +404,25 @@ class ModelCache:
             return None
 
         entry = self.cache[key]
+        now = time.monotonic()
 
         # Check TTL
-        if entry.ttl and datetime.now() - entry.created_at > entry.ttl:
+        if self._is_expired(key, entry, now):
             await self._remove_entry(key)
             self.stats["misses"] += 1
             return None
 
         # Update access info
-        entry.last_accessed = datetime.now()
+        entry.last_accessed = now
         entry.access_count += 1
 
         # Move to end of access order (most recently used)
-        if key in self.access_order:
-            self.access_order.remove(key)
-        self.access_order.append(key)
+        self.access_order.move_to_end(key)
 
         self.stats["hits"] += 1
         logger.debug(f"Cache hit for {key}")
 
-        return entry.data
+        return self._entry_data(entry)
 
     async def contains(self, key: str) -> bool:
         """Check if key exists in cache."""
@@ -189,7 +432,7 @@ class ModelCache:
         entry = self.cache[key]
 
         # Check TTL
-        if entry.ttl and datetime.now() - entry.created_at > entry.ttl:
+        if self._is_expired(key, entry, time.monotonic()):
             await self._remove_entry(key)
             return False
 
@@ -199,10 +442,25 @@ class ModelCache:
         """Remove entry from cache."""
         return await self._remove_entry(key)
 
+    def _is_expired(self, key: str, entry: CacheEntry, now: float) -> bool:
+        """Check whether an entry has outlived its TTL."""
+        if self.eviction_policy == "none" or self._is_pinned(key):
+            return False
+        return bool(entry.ttl) and now - entry.created_at > entry.ttl
+
+    def _is_pinned(self, key: str) -> bool:
+        """Check whether a key holds the latest version of a model."""
+        model_id = key.split(":", 2)[1] if key.startswith("model:") else None
+        return model_id is not None and self._latest_models.get(model_id) == key
+
     async def clear(self) -> None:
         """Clear all cache entries."""
         self.cache.clear()
         self.access_order.clear()
+        self._latest_models.clear()
+        self._blob_store.clear()
+        self._assembled.clear()
+        self._expiry_heap.clear()
         self.current_size = 0
         logger.info("Cache cleared")
 
@@ -211,54 +469,81 @@ class ModelCache:
         if key not in self.cache:
             return False
 
-        entry = self.cache[key]
-        self.current_size -= entry.size_bytes
-        del self.cache[key]
+        entry = self.cache.pop(key)
+        if entry.layer_refs is None:
+            self.current_size -= entry.size_bytes
+        else:
+            self._release_layers(entry.layer_refs)
+            self._assembled.pop(key, None)
+
+        if self._is_pinned(key):
+            del self._latest_models[key.split(":", 2)[1]]
 
-        if key in self.access_order:
-            self.access_order.remove(key)
+        self.access_order.pop(key, None)
 
         logger.debug(f"Removed {key} from cache")
         return True
 
     async def _make_space(self, required_bytes: int) -> None:
         """Make space in cache using LRU eviction."""
-        while (
-            self.current_size + required_bytes > self.max_size_bytes
-            and self.access_order
-        ):
-            # Remove least recently used entry
-            lru_key = self.access_order[0]
+        if self.eviction_policy == "none":
+            return
+
+        # Least recently used first, never evicting pinned latest models;
+        # the walk stops as soon as enough space would be freed
+        victims = []
+        free_bytes = self.max_size_bytes - self.current_size
+        for key in self.access_order:
+            if free_bytes >= required_bytes:
+                break
+            if self._is_pinned(key):
+                continue
+            victims.append(key)
+            free_bytes += self._reclaimable_bytes(self.cache[key])
+
+        for lru_key in victims:
             await self._remove_entry(lru_key)
             self.stats["evictions"] += 1
             logger.debug(f"Evicted {lru_key} to make space")
 
     async def cleanup_expired(self) -> int:
         """Remove expired entries from cache."""
-        expired_keys = []
-        now = datetime.now()
-
-        for key, entry in self.cache.items():
-            if entry.ttl and now - entry.created_at > entry.ttl:
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            await self._remove_entry(key)
+        expired_count = 0
+        now = time.monotonic()
+
+        # Only entries whose expiry has passed are popped. Pinned models are
+        # dropped from the heap and pushed again once they are superseded.
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            if entry is None or entry.expires_at != expires_at:
+                continue
+            if not self._is_pinned(key):
+                await self._remove_entry(key)
+                expired_count += 1
 
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired entries")
+        if expired_count:
+            logger.info(f"Cleaned up {expired_count} expired entries")
 
-        return len(expired_keys)
+        return expired_count
 
     async def _cleanup_loop(self) -> None:
         """Background cleanup loop."""
         while self._running:
             try:
                 await self.cleanup_expired()
-                await asyncio.sleep(300)  # Cleanup every 5 minutes
+                await asyncio.sleep(self._next_cleanup_delay())
             except Exception as e:
                 logger.error(f"Error in cleanup loop: {e}")
-                await asyncio.sleep(300)
+                await asyncio.sleep(CLEANUP_INTERVAL)
+
+    def _next_cleanup_delay(self) -> float:
+        """Sleep until the next expiry, but never longer than CLEANUP_INTERVAL."""
+        if not self._expiry_heap:
+            return CLEANUP_INTERVAL
+        delay = self._expiry_heap[0][0] - time.monotonic()
+        return min(CLEANUP_INTERVAL, max(delay, 0.0))
 
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -281,15 +566,24 @@ class ModelCache:
             return
 
         try:
-            cache_data = {
-                "cache": self.cache,
-                "access_order": self.access_order,
+            header = {
+                "access_order": list(self.access_order),
                 "current_size": self.current_size,
-                "stats": self.stats,
+                "stats": dict(self.stats),
+                "blob_count": len(self._blob_store),
             }
-
-            with open(self.persistence_path, "wb") as f:
-                pickle.dump(cache_data, f)
+            records = [
+                (digest, layer, refcount)
+                for digest, (layer, refcount) in self._blob_store.items()
+            ]
+            records.extend(self.cache[key] for key in self.access_order)
+
+            # The snapshot is written from a worker thread so the event loop
+            # keeps serving requests; entries are streamed one at a time
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, _write_cache_file, self.persistence_path, header, records
+            )
 
             logger.info(f"Cache persisted to {self.persistence_path}")
 
@@ -299,16 +593,23 @@ class ModelCache:
     async def _load_from_disk(self) -> None:
         """Load cache from disk."""
         try:
-            with open(self.persistence_path, "rb") as f:
-                cache_data = pickle.load(f)
+            loop = asyncio.get_running_loop()
+            cache_data = await loop.run_in_executor(
+                None, _read_cache_file, self.persistence_path
+            )
 
             self.cache = cache_data.get("cache", {})
-            self.access_order = cache_data.get("access_order", [])
+            self._blob_store = cache_data.get("blob_store", {})
+            self._assembled = {}
+            self.access_order = OrderedDict.fromkeys(cache_data.get("access_order", ()))
             self.current_size = cache_data.get("current_size", 0)
             self.stats = cache_data.get("stats", self.stats)
 
             # Validate loaded data
             await self._validate_loaded_cache()
+            self._expiry_heap = []
+            for key, entry in self.cache.items():
+                self._push_expiry(key, entry)
 
             logger.info(f"Cache loaded from {self.persistence_path}")
 
@@ -320,10 +621,23 @@ class ModelCache:
     async def _validate_loaded_cache(self) -> None:
         """Validate and cleanup loaded cache data."""
         invalid_keys = []
+        now = time.monotonic()
+        wall_now = time.time()
 
         for key, entry in self.cache.items():
+            # Entries from before monotonic timestamps cannot be aged
+            if entry.wall_created_at is None:
+                invalid_keys.append(key)
+                continue
+
+            # The monotonic clock restarts with the process, so rebase the
+            # entry's timestamps on its wall-clock age
+            offset = now - (wall_now - entry.wall_created_at) - entry.created_at
+            entry.created_at += offset
+            entry.last_accessed += offset
+
             # Check TTL
-            if entry.ttl and datetime.now() - entry.created_at > entry.ttl:
+            if entry.ttl and now - entry.created_at > entry.ttl:
                 invalid_keys.append(key)
                 continue
 
@@ -348,17 +662,34 @@ class ModelCache:
         model_weights: Dict[str, Any],
         version: str,
         metadata: Optional[Dict[str, Any]] = None,
+        original_timestamp: Optional[float] = None,
     ) -> bool:
-        """Cache a model with version info."""
+        """Cache a model with version info.
+
+        ``original_timestamp`` is when the producer created this version (epoch
+        seconds); it drives staleness, independent of when it reached the cache.
+        """
         cache_key = f"model:{model_id}:{version}"
         model_metadata = {
             "model_id": model_id,
             "version": version,
             "type": "model_weights",
+            "original_timestamp": (
+                time.time() if original_timestamp is None else original_timestamp
+            ),
             **(metadata or {}),
         }
 
-        return await self.put(cache_key, model_weights, metadata=model_metadata)
+        if not await self._put_layers(cache_key, model_weights, model_metadata):
+            return False
+
+        previous_key = self._latest_models.get(model_id)
+        self._latest_models[model_id] = cache_key
+
+        # The superseded version is no longer pinned and may expire again
+        if previous_key in self.cache and previous_key != cache_key:
+            self._push_expiry(previous_key, self.cache[previous_key])
+        return True
 
     async def get_model(self, model_id: str, version: str) -> Optional[Dict[str, Any]]:
         """Get a specific model version."""
@@ -369,7 +700,11 @@ class ModelCache:
         self, model_id: str = "global"
     ) -> Optional[Dict[str, Any]]:
         """Get the latest cached model."""
-        # Find the latest version
+        cache_key = self._latest_models.get(model_id)
+        if cache_key in self.cache:
+            return await self.get(cache_key)
+
+        # Find the latest version (e.g. after loading from disk)
         latest_version = None
         latest_timestamp = None
 
@@ -385,6 +720,59 @@ class ModelCache:
 
         return None
 
+    def _model_entries(self, model_id: str) -> List[CacheEntry]:
+        """Return the cached versions of a model."""
+        prefix = f"model:{model_id}:"
+        return [
+            entry
+            for key, entry in self.cache.items()
+            if key.startswith(prefix)
+            and entry.metadata
+            and entry.metadata.get("type") == "model_weights"
+        ]
+
+    async def get_fresh_models(
+        self, tau_max: float, model_id: str = "global"
+    ) -> List[Dict[str, Any]]:
+        """Get cached versions younger than ``tau_max`` seconds, newest first."""
+        cutoff = time.time() - tau_max
+        fresh = sorted(
+            (
+                entry
+                for entry in self._model_entries(model_id)
+                if entry.metadata.get("original_timestamp", 0.0) > cutoff
+            ),
+            key=lambda entry: entry.metadata["original_timestamp"],
+            reverse=True,
+        )
+
+        models = []
+        for entry in fresh:
+            model = await self.get(entry.key)
+            if model is not None:
+                models.append(model)
+        return models
+
+    async def evict_by_staleness(self, tau_max: float) -> int:
+        """Drop model versions created ``tau_max`` or more seconds ago."""
+        cutoff = time.time() - tau_max
+        stale_keys = [
+            key
+            for key, entry in self.cache.items()
+            if entry.metadata
+            and entry.metadata.get("type") == "model_weights"
+            and entry.metadata.get("original_timestamp", cutoff) <= cutoff
+            and not self._is_pinned(key)
+        ]
+
+        for key in stale_keys:
+            await self._remove_entry(key)
+
+        if stale_keys:
+            logger.info(f"Evicted {len(stale_keys)} stale model versions")
+
+        return len(stale_keys)
+
     async def cache_aggregation_result(
         self,
         round_id: str,
@@ -89,8 +89,8 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "fl-fog=fog_node.main:main",
-            "fog-node=fog_node.main:main",
+            "fl-fog=fog_node:run",
+            "fog-node=fog_node:run",
             "fl-fog-monitor=fog_node.monitoring:main",
         ],
     },
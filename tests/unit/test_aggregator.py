@@ -0,0 +1,178 @@
+"""
+Unit tests for RegionalAggregator class.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from fog_node.aggregator import (  # noqa: E402
+    AggregationStrategy,
+    EdgeUpdate,
+    RegionalAggregator,
+)
+
+
+class TestRegionalAggregator:
+    """Test suite for RegionalAggregator."""
+
+    async def _start_round(self, strategy=AggregationStrategy.FEDAVG, **kwargs):
+        """Create an aggregator with an open round that will not trigger."""
+        aggregator = RegionalAggregator(
+            "test_fog_node_001", strategy=strategy, min_clients=10, **kwargs
+        )
+        await aggregator.start_aggregation_round()
+        return aggregator
+
+    def _update(self, client_id, weights, sample_count=1, loss=0.0):
+        """Build an edge update."""
+        return EdgeUpdate(
+            client_id=client_id,
+            model_weights=weights,
+            sample_count=sample_count,
+            training_loss=loss,
+            timestamp=datetime.now(),
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "strategy", [AggregationStrategy.FEDAVG, AggregationStrategy.FEDPROX]
+    )
+    async def test_layout_mismatch_is_rejected_untouched(self, strategy):
+        """Test that updates off the round's layout leave the round unchanged."""
+        aggregator = await self._start_round(strategy)
+        ones = torch.ones(2)
+
+        assert await aggregator.add_edge_update(
+            self._update("edge_a", {"w": ones, "b": torch.ones(1)})
+        )
+        assert not await aggregator.add_edge_update(
+            self._update("edge_b", {"w": ones * 5, "b": torch.ones(2)}, 3)
+        )
+        assert not await aggregator.add_edge_update(
+            self._update("edge_c", {"w": ones, "b": torch.ones(1), "extra": ones}, 3)
+        )
+        assert not await aggregator.add_edge_update(
+            self._update("edge_d", {"w": ones * 5}, 3)
+        )
+
+        result = await aggregator._perform_aggregation()
+        await aggregator.cleanup()
+
+        assert result.participating_clients == ["edge_a"]
+        assert set(result.aggregated_weights) == {"w", "b"}
+        assert result.aggregated_weights["w"].tolist() == [1.0, 1.0]
+        assert result.aggregated_weights["b"].tolist() == [1.0]
+
+    @pytest.mark.asyncio
+    async def test_low_precision_updates_stay_compact(self):
+        """Test that BF16 and INT8 updates are stored compactly and upcast on sum."""
+        aggregator = await self._start_round(AggregationStrategy.FEDPROX)
+        aggregator.fedprox_mu = 0.0
+
+        assert await aggregator.add_edge_update(
+            self._update("edge_a", {"w": torch.full((4,), 2.0, dtype=torch.bfloat16)})
+        )
+        assert await aggregator.add_edge_update(
+            self._update("edge_b", {"w": (torch.full((4,), 8, dtype=torch.int8), 0.5)})
+        )
+
+        stored = [update.flat_weights.dtype for update in aggregator.pending_updates]
+        assert stored == [torch.bfloat16, torch.int8]
+
+        result = await aggregator._perform_aggregation()
+        await aggregator.cleanup()
+
+        assert result.aggregated_weights["w"].dtype == torch.float32
+        assert result.aggregated_weights["w"].tolist() == [3.0] * 4
+
+    @pytest.mark.asyncio
+    async def test_running_sum_dequantizes_int8(self):
+        """Test that FedAvg applies INT8 scales inside the running sum."""
+        aggregator = await self._start_round()
+
+        await aggregator.add_edge_update(
+            self._update(
+                "edge_a", {"w": (torch.tensor([4, -4], dtype=torch.int8), 0.25)}
+            )
+        )
+        await aggregator.add_edge_update(
+            self._update("edge_b", {"w": torch.tensor([3.0, 3.0])}, sample_count=3)
+        )
+
+        result = await aggregator._perform_aggregation()
+        await aggregator.cleanup()
+
+        assert result.aggregated_weights["w"].tolist() == [2.5, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_compiled_reduction_reuses_graph_across_client_counts(self):
+        """Test that a changing client count does not recompile the reduction."""
+        from torch._dynamo.utils import counters
+
+        torch._dynamo.reset()
+        counters.clear()
+        aggregator = await self._start_round(
+            AggregationStrategy.FEDPROX, compile_reduction=True
+        )
+        aggregator.fedprox_mu = 0.0
+
+        for client_count in (2, 3, 5):
+            for i in range(client_count):
+                await aggregator.add_edge_update(
+                    self._update(f"edge_{client_count}_{i}", {"w": torch.ones(3) * i})
+                )
+            result = await aggregator._perform_aggregation()
+            mean = (client_count - 1) / 2
+            assert result.aggregated_weights["w"].tolist() == [mean] * 3
+            aggregator.aggregation_task.cancel()
+            await asyncio.gather(aggregator.aggregation_task, return_exceptions=True)
+            await aggregator.start_aggregation_round()
+
+        await aggregator.cleanup()
+
+        assert counters["stats"]["unique_graphs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_only_valid_overflow_counts_as_dropped(self):
+        """Test that invalid updates to a full round are rejected, not dropped."""
+        aggregator = await self._start_round(max_pending_updates=1)
+        weights = {"w": torch.ones(2)}
+
+        assert await aggregator.add_edge_update(self._update("edge_a", weights))
+        assert not await aggregator.add_edge_update(self._update("edge_a", weights))
+        assert not await aggregator.add_edge_update(self._update("edge_b", {}))
+        assert not await aggregator.add_edge_update(
+            self._update("edge_c", weights, sample_count=0)
+        )
+        assert aggregator.dropped_updates == 0
+
+        assert not await aggregator.add_edge_update(self._update("edge_d", weights))
+        await aggregator.cleanup()
+
+        assert aggregator.dropped_updates == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_add_counts_accepted_updates(self):
+        """Test that a batch is added in one call and reports what it accepted."""
+        aggregator = await self._start_round()
+        weights = {"w": torch.ones(2)}
+
+        accepted = await aggregator.add_edge_updates(
+            [
+                self._update("edge_a", weights),
+                self._update("edge_a", weights),
+                self._update("edge_b", {"w": "not a tensor"}),
+                self._update("edge_c", weights, sample_count=3),
+            ]
+        )
+        await aggregator.cleanup()
+
+        assert accepted == 2
+        assert [u.client_id for u in aggregator.pending_updates] == [
+            "edge_a",
+            "edge_c",
+        ]
@@ -0,0 +1,232 @@
+"""
+Unit tests for CloudInterface class.
+"""
+
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import numpy as np
+import orjson
+import pytest
+
+from communication import cloud_interface as cloud_module
+from communication.cloud_interface import CloudInterface
+from fog_node.model_cache import ModelCache
+
+
+class TestCloudInterface:
+    """Test suite for CloudInterface."""
+
+    @pytest.fixture
+    def fog_node(self):
+        """Minimal fog node stand-in with an aggregation history."""
+        node = Mock()
+        node.node_id = "test_fog_node_001"
+        node.region = "test_region"
+        node.regional_aggregator.aggregation_history = []
+        node.regional_aggregator.recent_results.side_effect = (
+            lambda count: node.regional_aggregator.aggregation_history[-count:]
+        )
+        return node
+
+    @pytest.fixture
+    def cloud_interface(self, fog_node):
+        """Create CloudInterface instance."""
+        return CloudInterface("http://localhost:8000", 30, fog_node)
+
+    def _result(self, aggregation_round):
+        """Build an aggregation result stand-in."""
+        return Mock(
+            fog_node_id="test_fog_node_001",
+            aggregation_round=aggregation_round,
+            participating_clients=["edge_001"],
+            total_samples=100,
+            average_loss=0.5,
+            aggregated_weights={},
+            created_at=datetime.now(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_aggregation_results_batches_pending(
+        self, cloud_interface, fog_node
+    ):
+        """Test that unsent results go out in a single batch."""
+        fog_node.regional_aggregator.aggregation_history = [
+            self._result(1),
+            self._result(2),
+        ]
+        cloud_interface.batch_results = True
+        cloud_interface._send_aggregation_batch_http = AsyncMock(return_value=True)
+
+        await cloud_interface._send_aggregation_results()
+
+        cloud_interface._send_aggregation_batch_http.assert_awaited_once()
+        batch = cloud_interface._send_aggregation_batch_http.await_args.args[0]
+        results = orjson.loads(batch)["results"]
+        assert [r["aggregation_round"] for r in results] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_send_aggregation_results_skips_sent(self, cloud_interface, fog_node):
+        """Test that delivered results are not sent again."""
+        fog_node.regional_aggregator.aggregation_history = [self._result(1)]
+        cloud_interface.batch_results = True
+        cloud_interface._send_aggregation_batch_http = AsyncMock(return_value=True)
+
+        await cloud_interface._send_aggregation_results()
+        await cloud_interface._send_aggregation_results()
+
+        assert cloud_interface._send_aggregation_batch_http.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_send_aggregation_results_retries_failed(
+        self, cloud_interface, fog_node
+    ):
+        """Test that a rejected batch is retried on the next sync."""
+        fog_node.regional_aggregator.aggregation_history = [self._result(1)]
+        cloud_interface.batch_results = True
+        cloud_interface._send_aggregation_batch_http = AsyncMock(return_value=False)
+
+        await cloud_interface._send_aggregation_results()
+        await cloud_interface._send_aggregation_results()
+
+        assert cloud_interface._send_aggregation_batch_http.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_send_aggregation_results_posts_each_by_default(
+        self, cloud_interface, fog_node
+    ):
+        """Test that results go one per POST with their weights as lists."""
+        first, second = self._result(1), self._result(2)
+        first.aggregated_weights = {"w": np.array([[1.0, 2.0]], dtype=np.float32)}
+        second.aggregated_weights = {"w": np.arange(4)[::2]}
+        fog_node.regional_aggregator.aggregation_history = [first, second]
+        cloud_interface._send_aggregation_http = AsyncMock(return_value=True)
+
+        assert await cloud_interface._send_aggregation_results()
+
+        sent = [
+            orjson.loads(call.args[0])
+            for call in cloud_interface._send_aggregation_http.await_args_list
+        ]
+        assert [r["aggregated_weights"]["w"] for r in sent] == [[[1.0, 2.0]], [0, 2]]
+
+    @pytest.mark.asyncio
+    async def test_unencodable_result_does_not_block_queue(
+        self, cloud_interface, fog_node
+    ):
+        """Test that a result that cannot be encoded is dropped, not retried."""
+        broken = self._result(1)
+        broken.aggregated_weights = {"w": object()}
+        fog_node.regional_aggregator.aggregation_history = [broken, self._result(2)]
+        cloud_interface._send_aggregation_http = AsyncMock(return_value=True)
+
+        assert await cloud_interface._send_aggregation_results()
+        assert await cloud_interface._send_aggregation_results() is None
+
+        sent = cloud_interface._send_aggregation_http.await_args_list
+        assert [orjson.loads(c.args[0])["aggregation_round"] for c in sent] == [2]
+
+    def test_sent_result_ids_are_bounded(self, cloud_interface):
+        """Test that the sent-result set forgets the oldest keys."""
+        maxlen = cloud_interface._sent_result_ids.maxlen
+
+        for i in range(maxlen + 10):
+            cloud_interface._mark_result_sent(("test_fog_node_001", i))
+
+        assert len(cloud_interface._sent_result_set) == maxlen
+        assert ("test_fog_node_001", 0) not in cloud_interface._sent_result_set
+        assert ("test_fog_node_001", maxlen + 9) in cloud_interface._sent_result_set
+
+    @pytest.mark.asyncio
+    async def test_send_status_update_skips_unchanged(self, cloud_interface, fog_node):
+        """Test that an unchanged status is only posted again when forced."""
+        fog_node.get_status.return_value = {"node_id": "test_fog_node_001"}
+        cloud_interface._send_status_http = AsyncMock(return_value=True)
+
+        await cloud_interface._send_status_update()
+        await cloud_interface._send_status_update()
+        assert cloud_interface._send_status_http.await_count == 1
+
+        await cloud_interface._send_status_update(force=True)
+        assert cloud_interface._send_status_http.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_perform_sync_disconnects_on_cloud_outage(
+        self, cloud_interface, fog_node
+    ):
+        """Test that a sync where every request fails drops the connection."""
+        fog_node.get_status.return_value = {"node_id": "test_fog_node_001"}
+        fog_node.regional_aggregator.aggregation_history = [self._result(1)]
+        session = Mock()
+        session.get.side_effect = aiohttp.ClientConnectionError("cloud down")
+        session.post.side_effect = aiohttp.ClientConnectionError("cloud down")
+        cloud_interface._get_session = Mock(return_value=session)
+        cloud_interface.connected = True
+
+        await cloud_interface._perform_sync()
+
+        assert not cloud_interface.connected
+        assert cloud_interface.last_sync is None
+
+    @pytest.mark.asyncio
+    async def test_perform_sync_tolerates_partial_failure(
+        self, cloud_interface, fog_node
+    ):
+        """Test that one failed step keeps the connection and skips are ignored."""
+        fog_node.get_status.return_value = {"node_id": "test_fog_node_001"}
+        cloud_interface._send_status_http = AsyncMock(return_value=True)
+        cloud_interface._check_model_updates_http = AsyncMock(return_value=False)
+        cloud_interface.connected = True
+
+        await cloud_interface._perform_sync()
+        assert cloud_interface.connected
+
+        # Status unchanged and no results pending: only the failed check counts
+        await cloud_interface._perform_sync()
+        assert not cloud_interface.connected
+
+    @pytest.mark.asyncio
+    async def test_global_model_keeps_cloud_timestamp(self, cloud_interface, fog_node):
+        """Test that cached global models age from the cloud's timestamp."""
+        fog_node.model_cache = ModelCache(cache_size=1e-3)
+        fog_node.edge_interface.broadcast_model_update = AsyncMock()
+        produced = time.time() - 600
+
+        await cloud_interface._process_global_model_update(
+            {
+                "version": "v1",
+                "weights": {"w": [1.0]},
+                "timestamp": datetime.fromtimestamp(produced, timezone.utc).isoformat(),
+            }
+        )
+        await cloud_interface._process_global_model_update(
+            {"version": "v2", "weights": {"w": [2.0]}, "timestamp": produced + 590}
+        )
+
+        entries = fog_node.model_cache.cache
+        v1 = entries["model:global:v1"].metadata["original_timestamp"]
+        v2 = entries["model:global:v2"].metadata["original_timestamp"]
+        assert v1 == pytest.approx(produced)
+        assert v2 == produced + 590
+        assert await fog_node.model_cache.get_fresh_models(60) == [{"w": [2.0]}]
+
+    @pytest.mark.asyncio
+    async def test_grpc_sync_tracks_channel_health(self, fog_node, monkeypatch):
+        """Test that gRPC no-op calls do not hide an unreachable server."""
+        monkeypatch.setattr(cloud_module, "GRPC_READY_TIMEOUT", 0.05)
+        fog_node.get_status.return_value = {"node_id": "test_fog_node_001"}
+        fog_node.regional_aggregator.aggregation_history = [self._result(1)]
+        cloud = CloudInterface("grpc://127.0.0.1:1", 30, fog_node, grpc_pool_size=2)
+
+        await cloud._connect()
+        assert not cloud.connected
+        assert len(cloud._channel_pool) == 2
+
+        cloud.connected = True
+        await cloud._perform_sync()
+        await cloud._disconnect()
+
+        assert not cloud.connected
+        assert cloud.last_sync is None
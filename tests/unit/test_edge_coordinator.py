@@ -0,0 +1,309 @@
+"""
+Unit tests for EdgeCoordinator class.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from fog_node.edge_coordinator import EdgeCoordinator, EdgeDeviceStatus
+
+
+class TestEdgeCoordinator:
+    """Test suite for EdgeCoordinator."""
+
+    @pytest.fixture
+    def coordinator(self):
+        """Create EdgeCoordinator instance."""
+        return EdgeCoordinator("test_fog_node_001")
+
+    async def _register(self, coordinator, device_id, cpu_cores=2, memory_gb=4.0):
+        """Register a device with the given resources."""
+        capabilities = {"cpu_cores": cpu_cores, "memory_gb": memory_gb}
+        return await coordinator.register_device(
+            device_id, "raspberry_pi", capabilities
+        )
+
+    @pytest.mark.asyncio
+    async def test_assign_workload_prefers_best_device(self, coordinator):
+        """Test that workloads go to the highest-scoring available device."""
+        await self._register(coordinator, "edge_small", cpu_cores=1, memory_gb=1.0)
+        await self._register(coordinator, "edge_large")
+
+        first = await coordinator.assign_workload("training", {})
+        second = await coordinator.assign_workload("training", {})
+
+        assert coordinator.workload_assignments[first].device_id == "edge_large"
+        assert coordinator.workload_assignments[second].device_id == "edge_small"
+        assert await coordinator.assign_workload("training", {}) is None
+
+    @pytest.mark.asyncio
+    async def test_assign_workload_follows_status_updates(self, coordinator):
+        """Test that busy devices are skipped until they become available."""
+        await self._register(coordinator, "edge_large")
+        await self._register(coordinator, "edge_small", cpu_cores=1, memory_gb=1.0)
+        await coordinator.update_device_status("edge_large", EdgeDeviceStatus.BUSY)
+
+        workload_id = await coordinator.assign_workload("inference", {})
+        assert coordinator.workload_assignments[workload_id].device_id == "edge_small"
+
+        await coordinator.update_device_status("edge_large", EdgeDeviceStatus.IDLE)
+        workload_id = await coordinator.assign_workload("inference", {})
+        assert coordinator.workload_assignments[workload_id].device_id == "edge_large"
+
+    @pytest.mark.asyncio
+    async def test_assign_workload_with_filter_scans_devices(self, coordinator):
+        """Test that a device filter is honoured."""
+        await self._register(coordinator, "edge_large")
+        await self._register(coordinator, "edge_small", cpu_cores=1, memory_gb=1.0)
+
+        workload_id = await coordinator.assign_workload(
+            "training", {}, device_filter=lambda d: d.device_id == "edge_small"
+        )
+
+        assert coordinator.workload_assignments[workload_id].device_id == "edge_small"
+
+    @pytest.mark.asyncio
+    async def test_vectorized_scores_match_scalar_scores(self, coordinator):
+        """Test that the vectorized scoring agrees with _calculate_device_score."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b", cpu_cores=1)
+        await self._register(coordinator, "edge_c", memory_gb=2.0)
+        await coordinator.update_device_status(
+            "edge_a", EdgeDeviceStatus.ONLINE, {"avg_cpu_usage": 95.0}
+        )
+        await coordinator.update_device_status(
+            "edge_b", EdgeDeviceStatus.ONLINE, {"avg_memory_usage": 60.0}
+        )
+        device_ids = ["edge_a", "edge_b", "edge_c"]
+
+        scores = coordinator._score_slots(
+            [coordinator._device_slots[device_id] for device_id in device_ids]
+        )
+
+        expected = [
+            coordinator._calculate_device_score(
+                coordinator.connected_devices[device_id], "training", {}
+            )
+            for device_id in device_ids
+        ]
+        assert scores.tolist() == pytest.approx(expected)
+
+    @pytest.mark.asyncio
+    async def test_check_device_health_expires_silent_devices(self, coordinator):
+        """Test that only devices silent past the timeout are unregistered."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+        coordinator.connected_devices["edge_a"].last_seen -= 600
+        coordinator._last_seen_heap = sorted(
+            (info.last_seen, info.device_id)
+            for info in coordinator.connected_devices.values()
+        )
+
+        await coordinator._check_device_health()
+
+        assert list(coordinator.connected_devices) == ["edge_b"]
+        assert await coordinator.assign_workload("training", {}) is not None
+
+    @pytest.mark.asyncio
+    async def test_async_callbacks_run_concurrently(self, coordinator):
+        """Test that async listeners do not wait on each other or on failures."""
+        released = asyncio.Event()
+        seen = []
+
+        async def waiter(device_info):
+            await released.wait()
+            seen.append(device_info.device_id)
+
+        async def releaser(device_info):
+            released.set()
+
+        async def failing(device_info):
+            raise RuntimeError("listener failed")
+
+        for callback in (waiter, failing, releaser):
+            coordinator.add_event_callback("device_connected", callback)
+
+        await asyncio.wait_for(self._register(coordinator, "edge_a"), timeout=1.0)
+
+        assert seen == ["edge_a"]
+
+    @pytest.mark.asyncio
+    async def test_workload_ids_are_unique(self, coordinator):
+        """Test that workloads assigned in the same second get distinct ids."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+
+        first = await coordinator.assign_workload("training", {})
+        await coordinator.complete_workload(first, {})
+        second = await coordinator.assign_workload("training", {})
+
+        assert first != second
+
+    def test_check_delay_backs_off_while_idle(self, coordinator):
+        """Test that the monitoring interval doubles up to max_interval."""
+        delays = []
+        for idle_ticks in range(5):
+            coordinator._idle_ticks = idle_ticks
+            delays.append(coordinator._next_check_delay())
+
+        assert delays == [30.0, 60.0, 120.0, 240.0, 300.0]
+
+    @pytest.mark.asyncio
+    async def test_check_delay_wakes_for_next_expiry(self, coordinator):
+        """Test that backoff never sleeps past the next possible device expiry."""
+        await self._register(coordinator, "edge_a")
+        coordinator._idle_ticks = 4
+        coordinator.connected_devices["edge_a"].last_seen -= 200
+        coordinator._last_seen_heap = [
+            (coordinator.connected_devices["edge_a"].last_seen, "edge_a")
+        ]
+
+        assert coordinator._next_check_delay() == pytest.approx(100.0, abs=1.0)
+
+    @pytest.mark.asyncio
+    async def test_coordinator_stats_track_transitions(self, coordinator):
+        """Test that incrementally maintained stats follow device transitions."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+        await coordinator.register_device("watch_a", "smartwatch", {"cpu_cores": 1})
+        workload_id = await coordinator.assign_workload("training", {})
+        await coordinator.assign_workload("inference", {})
+
+        stats = coordinator.get_coordinator_stats()
+        assert stats["online_devices"] == 1
+        assert stats["busy_devices"] == 2
+        assert stats["active_workloads"] == 2
+        assert stats["device_types"] == {"raspberry_pi": 2, "smartwatch": 1}
+
+        await coordinator.complete_workload(workload_id, {})
+        await coordinator.unregister_device("watch_a")
+
+        stats = coordinator.get_coordinator_stats()
+        assert stats["total_devices"] == 2
+        assert stats["online_devices"] == 0
+        assert stats["busy_devices"] == 1
+        assert stats["active_workloads"] == 1
+        assert stats["device_types"] == {"raspberry_pi": 2}
+
+    @pytest.mark.asyncio
+    async def test_batch_assignment_avoids_greedy_overshoot(self, coordinator):
+        """Test that a batch keeps the only sensor device for data collection."""
+        pytest.importorskip("scipy")
+        await coordinator.register_device(
+            "edge_sensor",
+            "raspberry_pi",
+            {"cpu_cores": 4, "memory_gb": 8.0, "sensors": ["temperature"]},
+        )
+        await self._register(coordinator, "edge_plain", cpu_cores=1, memory_gb=1.0)
+
+        training_id, collection_id = await coordinator.assign_workloads_batch(
+            [("training", {}), ("data_collection", {})]
+        )
+
+        assignments = coordinator.workload_assignments
+        assert assignments[training_id].device_id == "edge_plain"
+        assert assignments[collection_id].device_id == "edge_sensor"
+
+    @pytest.mark.asyncio
+    async def test_finished_workloads_move_to_history(self, coordinator):
+        """Test that finished workloads leave the active set but stay queryable."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+        completed_id = await coordinator.assign_workload("training", {})
+        cancelled_id = await coordinator.assign_workload("training", {})
+
+        await coordinator.complete_workload(completed_id, {})
+        cancelled_device = coordinator.get_workload(cancelled_id).device_id
+        await coordinator.unregister_device(cancelled_device)
+
+        assert coordinator.workload_assignments == {}
+        assert coordinator.get_workload(completed_id).status == "completed"
+        assert coordinator.get_workload(cancelled_id).status == "cancelled"
+        assert await coordinator.complete_workload(cancelled_id, {})
+        assert coordinator.get_workload(cancelled_id).status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_active_workloads_time_out_at_deadline(self, coordinator):
+        """Test that overdue workloads fail once, whether or not they started."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+        running_id = await coordinator.assign_workload("training", {})
+        assigned_id = await coordinator.assign_workload("training", {})
+        coordinator.workload_assignments[running_id].status = "running"
+
+        coordinator._on_workload_deadline(running_id)
+        coordinator._on_workload_deadline(assigned_id)
+
+        assert coordinator.get_workload(running_id).status == "failed"
+        assert coordinator.get_workload(assigned_id).status == "failed"
+        assert coordinator.workload_assignments == {}
+        assert coordinator._timeout_handles == {}
+        assert all(
+            device.status == EdgeDeviceStatus.IDLE
+            for device in coordinator.connected_devices.values()
+        )
+
+    @pytest.mark.asyncio
+    async def test_status_updates_hold_state_lock(self, coordinator):
+        """Test that status changes wait for the lock and callbacks run after it."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+        workload_id = await coordinator.assign_workload("training", {})
+        reassigned = []
+
+        async def on_overloaded(device_info):
+            # Re-entering the coordinator would deadlock under the lock
+            reassigned.append(await coordinator.assign_workload("training", {}))
+
+        coordinator.add_event_callback("device_overloaded", on_overloaded)
+        device_id = coordinator.get_workload(workload_id).device_id
+
+        async with coordinator._state_lock:
+            update = asyncio.create_task(
+                coordinator.update_device_status(device_id, EdgeDeviceStatus.OVERLOADED)
+            )
+            await asyncio.sleep(0)
+            assert coordinator.get_workload(workload_id).status == "assigned"
+
+        assert await asyncio.wait_for(update, timeout=1.0)
+        assert coordinator.get_workload(workload_id).status == "cancelled"
+        assert len(reassigned) == 1 and reassigned[0] is not None
+
+        await coordinator.unregister_device(device_id)
+        await coordinator._handle_overloaded_device(device_id)
+
+    @pytest.mark.asyncio
+    async def test_softmax_selection_spreads_load(self):
+        """Test that a selection temperature lets lower-scored devices win."""
+        coordinator = EdgeCoordinator(
+            "test_fog_node_001",
+            selection_temperature=1e6,
+            rng=np.random.default_rng(0),
+        )
+        await self._register(coordinator, "edge_small", cpu_cores=1, memory_gb=1.0)
+        await self._register(coordinator, "edge_large")
+
+        chosen = set()
+        for _ in range(20):
+            workload_id = await coordinator.assign_workload("training", {})
+            chosen.add(coordinator.get_workload(workload_id).device_id)
+            await coordinator.complete_workload(workload_id, {})
+
+        assert chosen == {"edge_small", "edge_large"}
+
+    @pytest.mark.asyncio
+    async def test_low_battery_cancels_only_that_device(self, coordinator):
+        """Test that cancellation only touches the device's own workloads."""
+        await self._register(coordinator, "edge_a")
+        await self._register(coordinator, "edge_b")
+        first = await coordinator.assign_workload("training", {})
+        second = await coordinator.assign_workload("training", {})
+        device_id = coordinator.get_workload(first).device_id
+
+        await coordinator.update_device_status(device_id, EdgeDeviceStatus.LOW_BATTERY)
+
+        assert coordinator.get_workload(first).status == "cancelled"
+        assert coordinator.get_workload(second).status == "assigned"
+        assert device_id not in coordinator._device_workloads
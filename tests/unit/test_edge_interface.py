@@ -0,0 +1,124 @@
+"""
+Unit tests for EdgeInterface class.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from communication.edge_interface import EdgeInterface
+
+
+class TestEdgeInterface:
+    """Test suite for EdgeInterface."""
+
+    @pytest.fixture
+    def edge_interface(self):
+        """Create EdgeInterface instance with a stand-in fog node."""
+        return EdgeInterface("localhost:1883", Mock(node_id="test_fog_node_001"))
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_block_other_types(self, edge_interface):
+        """Test that a stuck message type keeps buffering while others flow."""
+        release = asyncio.Event()
+        requests = []
+        heartbeats = []
+
+        async def slow_model_request(device_id, payload):
+            requests.append(device_id)
+            await release.wait()
+
+        async def heartbeat_batch(batch):
+            heartbeats.extend(device_id for device_id, _ in batch)
+
+        edge_interface.message_handlers["model/request"] = slow_model_request
+        edge_interface.batch_handlers["device/heartbeat"] = heartbeat_batch
+
+        edge_interface._schedule_message("model/request", "edge_a", {})
+        edge_interface._flush_ingress()
+        stuck = edge_interface._dispatch_tasks["model/request"]
+        edge_interface._schedule_message("model/request", "edge_b", {})
+        edge_interface._schedule_message("device/heartbeat", "edge_c", {})
+        edge_interface._flush_ingress()
+        await edge_interface._dispatch_tasks["device/heartbeat"]
+
+        assert heartbeats == ["edge_c"]
+        assert requests == ["edge_a"]
+        assert edge_interface._pending_count == 2
+
+        release.set()
+        await stuck
+        edge_interface._flush_ingress()
+        await edge_interface._dispatch_tasks["model/request"]
+
+        assert requests == ["edge_a", "edge_b"]
+        assert edge_interface._pending_count == 0
+        assert edge_interface._dispatch_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_mqtt_loop_restarts_after_unexpected_error(self, edge_interface):
+        """Test that a non-MQTT error reconnects instead of ending ingest."""
+        attempts = []
+        reconnected = asyncio.Event()
+
+        class Client:
+            async def __aenter__(self):
+                attempts.append(len(attempts))
+                if len(attempts) == 1:
+                    raise RuntimeError("unexpected")
+                reconnected.set()
+                await asyncio.Event().wait()
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        edge_interface.mqtt_client = Client()
+        edge_interface._reconnect_backoff = 0.0
+
+        task = asyncio.create_task(edge_interface._mqtt_loop())
+        await asyncio.wait_for(reconnected.wait(), timeout=1.0)
+        task.cancel()
+
+        assert len(attempts) == 2
+        assert not edge_interface.connected
+
+    @pytest.mark.asyncio
+    async def test_training_batch_skips_invalid_entries(self, edge_interface):
+        """Test that bad entries are counted and the gateway is always acked."""
+        fog_node = edge_interface.fog_node
+        fog_node.submit_training_updates = AsyncMock(return_value=1)
+        edge_interface._send_to_device = AsyncMock()
+
+        await edge_interface._handle_training_batch(
+            "gateway_a",
+            {
+                "updates": [
+                    {"device_id": "edge_a", "weights": {"w": [1.0, 2.0]}},
+                    {"weights": {"w": [1.0]}},
+                    {"device_id": "edge_c", "weights_raw": {"w": "not base64!"}},
+                ]
+            },
+        )
+
+        updates = fog_node.submit_training_updates.await_args.args[0]
+        assert [device_id for device_id, _ in updates] == ["edge_a"]
+        gateway_id, message_type, ack = edge_interface._send_to_device.await_args.args
+        assert (gateway_id, message_type) == ("gateway_a", "training/batch_ack")
+        assert ack["status"] == "partial"
+        assert (ack["accepted"], ack["invalid"], ack["total"]) == (1, 2, 3)
+
+    @pytest.mark.asyncio
+    async def test_training_batch_ack_reports_rejection(self, edge_interface):
+        """Test that a batch with nothing accepted is acked as failed."""
+        edge_interface.fog_node.submit_training_updates = AsyncMock(return_value=0)
+        edge_interface._send_to_device = AsyncMock()
+
+        await edge_interface._handle_training_batch(
+            "gateway_a",
+            {"updates": [{"device_id": "edge_a", "weights": {"w": [1.0]}}]},
+        )
+
+        ack = edge_interface._send_to_device.await_args.args[2]
+        assert ack["status"] == "failed"
+        assert ack["accepted"] == 0
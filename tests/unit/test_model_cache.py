@@ -0,0 +1,173 @@
+"""
+Unit tests for ModelCache class.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from fog_node.model_cache import ModelCache, _estimate_size
+
+
+class TestModelCache:
+    """Test suite for ModelCache."""
+
+    @pytest.fixture
+    def model_cache(self):
+        """Create a small ModelCache instance."""
+        return ModelCache(cache_size=1e-6)  # ~1 KB
+
+    @pytest.mark.asyncio
+    async def test_latest_model_survives_ttl(self, model_cache):
+        """Test that the latest model version is pinned against expiry."""
+        model_cache.default_ttl = -1.0
+        await model_cache.cache_model("global", {"w": [1.0]}, "v1")
+        await model_cache.cache_model("global", {"w": [2.0]}, "v2")
+
+        assert await model_cache.cleanup_expired() == 1
+        assert await model_cache.get_latest_model() == {"w": [2.0]}
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_skips_latest_model(self, model_cache):
+        """Test that filling the cache evicts other entries before the model."""
+        await model_cache.cache_model("global", {"w": [1.0]}, "v1")
+        await model_cache.put("blob", b"x" * 400)
+
+        assert await model_cache.put("other", b"y" * 700)
+        assert "blob" not in model_cache.cache
+        assert await model_cache.get_latest_model() == {"w": [1.0]}
+
+    @pytest.mark.asyncio
+    async def test_no_eviction_policy_rejects_overflow(self):
+        """Test that warm-cache mode keeps entries and rejects what won't fit."""
+        model_cache = ModelCache(cache_size=1e-6, eviction_policy="none")
+        await model_cache.put("blob", b"x" * 600, ttl=-1.0)
+
+        assert not await model_cache.put("other", b"y" * 600)
+        assert await model_cache.cleanup_expired() == 0
+        assert await model_cache.get("blob") == b"x" * 600
+
+    @pytest.mark.asyncio
+    async def test_staleness_uses_original_timestamp(self, model_cache):
+        """Test that staleness follows the producer's timestamp."""
+        now = time.time()
+        await model_cache.cache_model(
+            "global", {"w": [1.0]}, "v1", original_timestamp=now - 600
+        )
+        await model_cache.cache_model(
+            "global", {"w": [2.0]}, "v2", original_timestamp=now - 10
+        )
+        await model_cache.cache_model(
+            "global", {"w": [3.0]}, "v3", original_timestamp=now
+        )
+
+        assert await model_cache.get_fresh_models(60) == [{"w": [3.0]}, {"w": [2.0]}]
+        assert await model_cache.evict_by_staleness(60) == 1
+        assert "model:global:v1" not in model_cache.cache
+
+    @pytest.mark.asyncio
+    async def test_get_refreshes_lru_position(self, model_cache):
+        """Test that reading an entry protects it from the next eviction."""
+        await model_cache.put("a", b"x" * 300)
+        await model_cache.put("b", b"y" * 300)
+        await model_cache.get("a")
+
+        assert await model_cache.put("c", b"z" * 500)
+        assert list(model_cache.access_order) == ["a", "c"]
+
+    def test_estimate_size_measures_buffers(self):
+        """Test that weight buffers are sized by their bytes, not by pickling."""
+        weights = {
+            "layer.weight": np.zeros((64, 32), dtype=np.float32),
+            "layer.bias": (np.zeros(32, dtype=np.int8), 0.5),
+        }
+
+        size = _estimate_size(weights)
+
+        assert size >= 64 * 32 * 4 + 32
+        assert size < 64 * 32 * 4 + 32 + 100
+
+    @pytest.mark.asyncio
+    async def test_persistence_round_trip(self, tmp_path):
+        """Test that cached arrays survive a save and load intact and writable."""
+        path = tmp_path / "cache.bin"
+        weights = {"layer.weight": np.arange(12, dtype=np.float32).reshape(3, 4)}
+        cache = ModelCache(persistence_path=str(path))
+        await cache.cache_model("global", weights, "v1")
+        await cache._save_to_disk()
+
+        restored = ModelCache(persistence_path=str(path))
+        await restored._load_from_disk()
+
+        model = await restored.get_model("global", "v1")
+        np.testing.assert_array_equal(model["layer.weight"], weights["layer.weight"])
+        assert model["layer.weight"].flags.writeable
+
+    @pytest.mark.asyncio
+    async def test_identical_layers_are_stored_once(self):
+        """Test that layers shared across versions are deduplicated."""
+        cache = ModelCache()
+        frozen = np.ones((16, 16), dtype=np.float32)
+        await cache.cache_model("global", {"emb": frozen, "head": np.zeros(4)}, "v1")
+        await cache.cache_model(
+            "global", {"emb": frozen.copy(), "head": np.ones(4)}, "v2"
+        )
+
+        assert len(cache._blob_store) == 3
+        assert cache.current_size == frozen.nbytes + 2 * np.zeros(4).nbytes
+
+        await cache.remove("model:global:v1")
+
+        assert len(cache._blob_store) == 2
+        assert cache.current_size == frozen.nbytes + np.ones(4).nbytes
+        model = await cache.get_model("global", "v2")
+        np.testing.assert_array_equal(model["emb"], frozen)
+
+    @pytest.mark.asyncio
+    async def test_deduplicated_model_reads_are_stable(self):
+        """Test that repeated reads of a model return the same weights object."""
+        cache = ModelCache()
+        await cache.cache_model("global", {"w": np.ones(4)}, "v1")
+
+        first = await cache.get_latest_model()
+        assert await cache.get_model("global", "v1") is first
+
+        await cache.cache_model("global", {"w": np.ones(4)}, "v1")
+        replaced = await cache.get_latest_model()
+        assert replaced is not first
+        np.testing.assert_array_equal(replaced["w"], first["w"])
+
+        await cache.remove("model:global:v1")
+        assert cache._assembled == {}
+
+    @pytest.mark.asyncio
+    async def test_reload_ages_entries_by_wall_clock(self, tmp_path):
+        """Test that monotonic timestamps are rebased when a cache is reloaded."""
+        path = tmp_path / "cache.bin"
+        cache = ModelCache(ttl_hours=1.0, persistence_path=str(path))
+        await cache.put("old", b"x")
+        await cache.put("new", b"y")
+        cache.cache["old"].wall_created_at -= 7200
+        await cache._save_to_disk()
+
+        restored = ModelCache(ttl_hours=1.0, persistence_path=str(path))
+        await restored._load_from_disk()
+
+        assert list(restored.cache) == ["new"]
+        age = time.monotonic() - restored.cache["new"].created_at
+        assert 0 <= age < 60
+
+    @pytest.mark.asyncio
+    async def test_cleanup_skips_replaced_entries(self):
+        """Test that stale heap entries are ignored and the loop wakes for expiry."""
+        cache = ModelCache()
+        await cache.put("a", b"x", ttl=-1.0)
+        await cache.put("a", b"y")
+
+        assert await cache.cleanup_expired() == 0
+        assert await cache.get("a") == b"y"
+        assert cache._next_cleanup_delay() == 300.0
+
+        await cache.put("b", b"z", ttl=10.0)
+        assert cache._next_cleanup_delay() == pytest.approx(10.0, abs=1.0)
@@ -0,0 +1,94 @@
+"""
+Unit tests for PeerInterface class.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from communication.peer_interface import CollaborationRequest, PeerInterface
+
+
+class TestPeerInterface:
+    """Test suite for PeerInterface."""
+
+    @pytest.fixture
+    def peer_interface(self, test_config):
+        """Create PeerInterface instance."""
+        return PeerInterface(test_config["network"]["peer_interface"])
+
+    def _peer_info(self, node_id, region="europe-west"):
+        """Build peer registration data."""
+        return {
+            "node_id": node_id,
+            "region": region,
+            "endpoint": f"http://{node_id}:8080",
+        }
+
+    @pytest.mark.asyncio
+    async def test_broadcast_to_region_only_targets_region(self, peer_interface):
+        """Test that a region broadcast only reaches that region's active peers."""
+        await peer_interface.register_peer(self._peer_info("fog_a"))
+        await peer_interface.register_peer(self._peer_info("fog_b"))
+        await peer_interface.register_peer(self._peer_info("fog_c", "us-east"))
+        peer_interface.peer_nodes["fog_b"].status = "unreachable"
+        peer_interface.send_collaboration_request = AsyncMock(return_value="req")
+
+        await peer_interface.broadcast_to_region("europe-west", "model_sharing", {})
+
+        targets = [
+            call.args[0]
+            for call in peer_interface.send_collaboration_request.await_args_list
+        ]
+        assert targets == ["fog_a"]
+
+    @pytest.mark.asyncio
+    async def test_region_index_follows_reregistration(self, peer_interface):
+        """Test that moving or removing a peer keeps the region index in sync."""
+        await peer_interface.register_peer(self._peer_info("fog_a"))
+        await peer_interface.register_peer(self._peer_info("fog_a", "us-east"))
+
+        assert "fog_a" not in peer_interface._peers_by_region["europe-west"]
+        assert "fog_a" in peer_interface._peers_by_region["us-east"]
+
+        peer_interface._remove_peer("fog_a")
+
+        assert "fog_a" not in peer_interface.peer_nodes
+        assert "us-east" not in peer_interface._peers_by_region
+
+    @pytest.mark.asyncio
+    async def test_expire_peers_keeps_recently_seen(self, peer_interface):
+        """Test that only peers silent past the threshold are expired."""
+        await peer_interface.register_peer(self._peer_info("fog_a"))
+        await peer_interface.register_peer(self._peer_info("fog_b"))
+        peer_interface.peer_nodes["fog_a"].last_seen -= 600
+        peer_interface._expiry_heap = [
+            (peer.last_seen, peer.node_id)
+            for peer in peer_interface.peer_nodes.values()
+        ]
+
+        expired = peer_interface._expire_peers(300)
+
+        assert expired == ["fog_a"]
+        assert list(peer_interface.peer_nodes) == ["fog_b"]
+        assert peer_interface._expiry_heap == [
+            (peer_interface.peer_nodes["fog_b"].last_seen, "fog_b")
+        ]
+
+    def test_collaboration_request_round_trip(self):
+        """Test that a request survives to_dict/from_dict and bad input is rejected."""
+        request = CollaborationRequest(
+            request_id="req_1",
+            source_node="fog_a",
+            target_node="fog_b",
+            request_type="model_sharing",
+            data={"action": "share"},
+            timestamp=datetime(2024, 1, 1, 12, 0),
+            priority=2,
+        )
+
+        assert CollaborationRequest.from_dict(request.to_dict()) == request
+
+        with pytest.raises(KeyError):
+            CollaborationRequest.from_dict({"request_id": "req_2"})